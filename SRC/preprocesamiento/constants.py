@@ -6,6 +6,11 @@ Constantes del módulo de preprocesamiento.
 MIN_REQUIRED_NUTRIENTS = 2  # Mínimo de valores nutricionales no nulos requeridos
 MISSING_DATA_THRESHOLD = 0.8  # Si un campo tiene >80% nulos, se considera para eliminación
 OUTLIER_STD_THRESHOLD = 3  # Desviaciones estándar para detección de outliers
+NUMBA_OUTLIERS_MIN_ROWS = 1_000_000  # Filas a partir de las que se usa el kernel Numba (si está instalado)
+
+# Parámetros de carga por bloques (modo streaming)
+CSV_CHUNK_SIZE = 50_000  # Filas por bloque al leer el CSV
+QUICK_STATS_SAMPLE_SIZE = 50_000  # Filas usadas para estadísticas rápidas
 
 # Campos obligatorios en el CSV
 REQUIRED_FIELDS = ["url", "product_name"]
@@ -55,6 +60,9 @@ NUMERIC_FIELDS = [
     "numero_raciones"
 ] + NUTRITIONAL_FIELDS
 
+# Campos de precio
+PRICE_FIELDS = ["precio_total", "precio_por_cantidad"]
+
 # Unidades de peso/volumen válidas
 VALID_WEIGHT_UNITS = ["g", "kg", "mg"]
 VALID_VOLUME_UNITS = ["ml", "l", "cl", "dl"]
@@ -87,6 +95,15 @@ CALORIE_CATEGORIES = {
     "muy_alto": (500, float('inf'))
 }
 
+# Categorías fijas de las columnas categóricas derivadas (código 0 = desconocido)
+CALORIE_CATEGORY_LABELS = ["desconocido"] + list(CALORIE_CATEGORIES.keys())
+MACRONUTRIENT_PROFILE_LABELS = [
+    "desconocido",
+    "alto_en_grasas",
+    "alto_en_carbohidratos",
+    "alto_en_proteinas"
+]
+
 # Factor de conversión energía (1 kcal ≈ 4.184 kJ)
 KCAL_TO_KJ_FACTOR = 4.184
 ENERGY_TOLERANCE = 0.10  # Tolerancia del 10% en la conversión energética
@@ -137,6 +154,13 @@ DOMAIN_STOPWORDS = {
 # Configuración de tokenización
 MIN_TOKEN_LENGTH = 2  # Longitud mínima de tokens a conservar
 MAX_TOKEN_LENGTH = 50  # Longitud máxima de tokens válidos
+TOKEN_PATTERN = r"[^\W\d_]+"  # Solo letras (descarta puntuación y números)
+USE_NLTK_TOKENIZER = False  # Usar word_tokenize de NLTK en lugar de TOKEN_PATTERN
+# Motor de tokenización sin NLTK: "regex" (TOKEN_PATTERN) o "fast"
+# (str.translate de la puntuación a espacios + split, conserva números)
+TOKENIZER_ENGINE = "regex"
+TOKENIZER_ENGINES = ("regex", "fast")
+FAST_TOKENIZER_EXTRA_PUNCTUATION = "¡¿«»—–…"  # Además de string.punctuation
 
 # Configuración de stemming/lemmatización
 USE_STEMMING = True  # Usar stemming en lugar de lematización (más rápido)
@@ -145,3 +169,25 @@ STEMMER_LANGUAGE = "spanish"
 # Campos que requieren procesamiento especial
 CATEGORICAL_TEXT_FIELDS = ["categorias", "alergenos", "certificaciones"]
 SEPARATOR_FOR_CATEGORIES = ","  # Separador usado en listas
+
+# Procesos para limpiar campos de texto en paralelo (None = os.cpu_count(), 1 = secuencial)
+TEXT_NORMALIZATION_WORKERS = None
+# Mínimo de filas para repartir la limpieza entre procesos (por debajo, el
+# arranque del pool cuesta más que la limpieza)
+PARALLEL_TEXT_NORMALIZATION_MIN_ROWS = 200_000
+
+# Tamaño de la caché LRU de textos limpios (por instancia de TextCleaner)
+CLEAN_TEXT_CACHE_SIZE = 8192
+
+# Tamaño de la caché LRU de textos tokenizados (por instancia de TextTokenizer)
+TOKENIZE_CACHE_SIZE = 100_000
+
+# Tamaño de la caché LRU de raíces por token (única por idioma del stemmer,
+# compartida por todas las instancias de TextTokenizer del proceso)
+STEM_CACHE_SIZE = 200_000
+
+# Procesos para tokenizar los textos distintos de una columna
+# (None = os.cpu_count(), 1 = secuencial)
+TOKENIZATION_WORKERS = None
+# Mínimo de textos distintos para repartir la tokenización entre procesos
+PARALLEL_TOKENIZATION_MIN_TEXTS = 50_000
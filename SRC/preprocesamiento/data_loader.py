@@ -3,18 +3,25 @@ Carga de datos desde CSV y estadísticas iniciales.
 """
 
 import logging
+import logging.handlers
+import numpy as np
 import pandas as pd
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
 
 from .config import INPUT_CSV, ENCODING
-from .constants import REQUIRED_FIELDS
+from .constants import REQUIRED_FIELDS, CSV_CHUNK_SIZE, QUICK_STATS_SAMPLE_SIZE
 
 
 def setup_logger(name: str, log_file: Path, level=logging.INFO) -> logging.Logger:
     """
     Configura un logger con archivo y formato específico.
 
+    Las escrituras al archivo se acumulan en un MemoryHandler y se vuelcan en
+    bloque (al llenarse el buffer, ante un WARNING o con flush_logger), en
+    lugar de hacer una escritura por línea.
+
     Args:
         name: Nombre del logger
         log_file: Ruta del archivo de log
@@ -46,12 +53,31 @@ def setup_logger(name: str, log_file: Path, level=logging.INFO) -> logging.Logge
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
 
-    logger.addHandler(file_handler)
+    # Buffer en memoria delante del archivo
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.WARNING,
+        target=file_handler
+    )
+    memory_handler.setLevel(level)
+
+    logger.addHandler(memory_handler)
     logger.addHandler(console_handler)
 
     return logger
 
 
+def flush_logger(logger: logging.Logger) -> None:
+    """
+    Vuelca al archivo los registros acumulados en los handlers del logger.
+
+    Args:
+        logger: Logger configurado con setup_logger
+    """
+    for handler in logger.handlers:
+        handler.flush()
+
+
 class DataLoader:
     """Carga y valida datos desde CSV."""
 
@@ -76,10 +102,10 @@ class DataLoader:
             FileNotFoundError: Si el archivo no existe
             pd.errors.EmptyDataError: Si el archivo está vacío
         """
-        self.logger.info(f"Cargando datos desde {self.input_file}")
+        self.logger.info("Cargando datos desde %s", self.input_file)
 
         if not self.input_file.exists():
-            self.logger.error(f"Archivo no encontrado: {self.input_file}")
+            self.logger.error("Archivo no encontrado: %s", self.input_file)
             raise FileNotFoundError(f"No se encontró el archivo: {self.input_file}")
 
         try:
@@ -91,28 +117,54 @@ class DataLoader:
                 raise pd.errors.EmptyDataError("El archivo CSV está vacío")
 
             self.logger.info(
-                f"Se cargaron {len(df)} productos con {len(df.columns)} columnas"
+                "Se cargaron %d productos con %d columnas", len(df), len(df.columns)
             )
-            self.logger.info(f"Columnas: {', '.join(df.columns.tolist())}")
+            self.logger.info("Columnas: %s", ", ".join(df.columns.tolist()))
 
             return df
 
         except pd.errors.EmptyDataError as e:
-            self.logger.error(f"Error: Archivo CSV vacío - {e}")
+            self.logger.error("Error: Archivo CSV vacío - %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Error inesperado al cargar CSV: {e}")
+            self.logger.error("Error inesperado al cargar CSV: %s", e)
             raise
 
-    def validate_structure(self, df: pd.DataFrame) -> pd.DataFrame:
+    def iter_chunks(self, chunksize: int = CSV_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
         """
-        Valida que el DataFrame tenga la estructura mínima requerida.
+        Carga los datos del CSV por bloques, sin materializar el archivo completo.
+        La estructura se valida una sola vez, con las columnas del primer bloque.
 
         Args:
-            df: DataFrame a validar
+            chunksize: Número de filas por bloque
 
-        Returns:
-            DataFrame validado (sin cambios si es válido)
+        Yields:
+            DataFrame con cada bloque de productos
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+            ValueError: Si faltan columnas obligatorias
+        """
+        self.logger.info(
+            "Cargando datos por bloques de %d filas desde %s", chunksize, self.input_file
+        )
+
+        if not self.input_file.exists():
+            self.logger.error("Archivo no encontrado: %s", self.input_file)
+            raise FileNotFoundError(f"No se encontró el archivo: {self.input_file}")
+
+        with pd.read_csv(self.input_file, encoding=ENCODING, chunksize=chunksize) as reader:
+            for i, chunk in enumerate(reader):
+                if i == 0:
+                    self.validate_columns(chunk.columns.tolist())
+                yield chunk
+
+    def validate_columns(self, columns: List[str]) -> None:
+        """
+        Valida que la lista de columnas contenga los campos obligatorios.
+
+        Args:
+            columns: Nombres de las columnas a validar
 
         Raises:
             ValueError: Si faltan columnas obligatorias
@@ -120,7 +172,7 @@ class DataLoader:
         self.logger.info("Validando estructura del DataFrame")
 
         # Verificar columnas obligatorias
-        missing_fields = [field for field in REQUIRED_FIELDS if field not in df.columns]
+        missing_fields = [field for field in REQUIRED_FIELDS if field not in columns]
 
         if missing_fields:
             error_msg = f"Faltan campos obligatorios: {missing_fields}"
@@ -128,6 +180,21 @@ class DataLoader:
             raise ValueError(error_msg)
 
         self.logger.info("Estructura validada correctamente")
+
+    def validate_structure(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Valida que el DataFrame tenga la estructura mínima requerida.
+
+        Args:
+            df: DataFrame a validar
+
+        Returns:
+            DataFrame validado (sin cambios si es válido)
+
+        Raises:
+            ValueError: Si faltan columnas obligatorias
+        """
+        self.validate_columns(df.columns.tolist())
         return df
 
     def get_data_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -151,15 +218,9 @@ class DataLoader:
             "data_types": {}
         }
 
-        # Contar valores nulos por columna
-        null_counts = df.isnull().sum()
-        for col, count in null_counts.items():
-            if count > 0:
-                percentage = round(count / len(df) * 100, 2)
-                stats["missing_data"][col] = {
-                    "count": int(count),
-                    "percentage": percentage
-                }
+        # Contar valores nulos por columna (sin materializar la máscara booleana)
+        null_counts = len(df) - df.count()
+        stats["missing_data"] = self._missing_data_report(null_counts, len(df))
 
         # Tipos de datos
         stats["data_types"] = df.dtypes.astype(str).to_dict()
@@ -175,12 +236,115 @@ class DataLoader:
             stats["country_distribution"] = country_count.head(10).to_dict()
 
         self.logger.info(
-            f"Estadísticas calculadas: {stats['total_products']} productos, "
-            f"{stats['total_columns']} columnas, {stats['memory_mb']} MB"
+            "Estadísticas calculadas: %d productos, %d columnas, %s MB",
+            stats["total_products"], stats["total_columns"], stats["memory_mb"]
         )
 
         return stats
 
+    def get_quick_statistics(
+        self,
+        df: pd.DataFrame,
+        sample_size: int = QUICK_STATS_SAMPLE_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Calcula estadísticas aproximadas sobre las primeras filas del DataFrame.
+        Suficiente para estimar tasas de nulos y categorías más frecuentes.
+
+        Args:
+            df: DataFrame con los productos (o primer bloque en modo streaming)
+            sample_size: Número de filas de la muestra
+
+        Returns:
+            Diccionario con estadísticas de la muestra
+        """
+        stats = self.get_data_statistics(df.head(sample_size))
+        stats["sample_size"] = stats["total_products"]
+
+        return stats
+
+    def get_streaming_statistics(self, chunksize: int = CSV_CHUNK_SIZE) -> Dict[str, Any]:
+        """
+        Calcula estadísticas exactas recorriendo el CSV por bloques,
+        acumulando conteos en lugar de concatenar los bloques.
+
+        Args:
+            chunksize: Número de filas por bloque
+
+        Returns:
+            Diccionario con estadísticas (mismas claves que get_data_statistics,
+            salvo memory_mb)
+        """
+        self.logger.info("Calculando estadísticas de los datos por bloques")
+
+        total = 0
+        columns = []
+        data_types = {}
+        null_counts = None
+        tiendas_count = Counter()
+        country_count = Counter()
+
+        for chunk in self.iter_chunks(chunksize):
+            if null_counts is None:
+                columns = chunk.columns.tolist()
+                data_types = chunk.dtypes.astype(str).to_dict()
+                null_counts = len(chunk) - chunk.count()
+            else:
+                null_counts += len(chunk) - chunk.count()
+
+            total += len(chunk)
+
+            if "tiendas" in chunk.columns:
+                tiendas_count.update(chunk["tiendas"].dropna())
+            if "country" in chunk.columns:
+                country_count.update(chunk["country"].dropna())
+
+        stats = {
+            "total_products": total,
+            "total_columns": len(columns),
+            "columns": columns,
+            "missing_data": {},
+            "data_types": data_types
+        }
+
+        if null_counts is not None:
+            stats["missing_data"] = self._missing_data_report(null_counts, total)
+
+        if "tiendas" in columns:
+            stats["tiendas_distribution"] = dict(tiendas_count.most_common(10))
+        if "country" in columns:
+            stats["country_distribution"] = dict(country_count.most_common(10))
+
+        self.logger.info(
+            "Estadísticas calculadas: %d productos, %d columnas",
+            stats["total_products"], stats["total_columns"]
+        )
+
+        return stats
+
+    @staticmethod
+    def _missing_data_report(null_counts: pd.Series, total: int) -> Dict[str, Any]:
+        """
+        Construye el reporte de valores nulos por columna.
+
+        Args:
+            null_counts: Número de nulos por columna
+            total: Número total de filas
+
+        Returns:
+            Diccionario columna → conteo y porcentaje (solo columnas con nulos)
+        """
+        missing_data = {}
+        for col, count in null_counts.items():
+            if count > 0:
+                percentage = round(count / total * 100, 2)
+                missing_data[col] = {
+                    "count": int(count),
+                    "percentage": percentage
+                }
+
+        return missing_data
+
     def get_nutrition_coverage(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Calcula la cobertura de datos nutricionales.
@@ -198,26 +362,31 @@ class DataLoader:
             "fields_coverage": {}
         }
 
-        for field in NUTRITIONAL_FIELDS:
-            if field in df.columns:
-                non_null = df[field].notna().sum()
-                percentage = round(non_null / len(df) * 100, 2)
-                coverage["fields_coverage"][field] = {
-                    "count": int(non_null),
-                    "percentage": percentage
-                }
+        # Una sola pasada sobre la matriz de no nulos sirve para ambos conteos
+        present = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
+        notna_matrix = df[present].notna().to_numpy()
+        per_row = notna_matrix.sum(axis=1)
+        per_col = notna_matrix.sum(axis=0)
+
+        for field, non_null in zip(present, per_col):
+            percentage = round(non_null / len(df) * 100, 2)
+            coverage["fields_coverage"][field] = {
+                "count": int(non_null),
+                "percentage": percentage
+            }
 
         # Productos con al menos N valores nutricionales
-        if all(field in df.columns for field in NUTRITIONAL_FIELDS):
-            nutrition_cols = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
-            products_with_nutrition = df[nutrition_cols].notna().sum(axis=1)
+        if len(present) == len(NUTRITIONAL_FIELDS):
+            # at_least[k] = productos con >= k nutrientes (suma acumulada desde la cola)
+            histogram = np.bincount(per_row, minlength=len(present) + 1)
+            at_least = np.cumsum(histogram[::-1])[::-1]
 
             coverage["products_with_at_least"] = {
-                "1_nutrient": int((products_with_nutrition >= 1).sum()),
-                "2_nutrients": int((products_with_nutrition >= 2).sum()),
-                "3_nutrients": int((products_with_nutrition >= 3).sum()),
-                "5_nutrients": int((products_with_nutrition >= 5).sum()),
-                "all_nutrients": int((products_with_nutrition == len(nutrition_cols)).sum())
+                "1_nutrient": int(at_least[1]),
+                "2_nutrients": int(at_least[2]),
+                "3_nutrients": int(at_least[3]),
+                "5_nutrients": int(at_least[5]),
+                "all_nutrients": int(at_least[len(present)])
             }
 
         self.logger.info("Cobertura nutricional calculada")
@@ -3,14 +3,25 @@ Ingeniería de características: creación de características derivadas.
 """
 
 import logging
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 
 from .constants import (
     THRESHOLD_HIGH_SALT,
     THRESHOLD_HIGH_SUGAR,
     THRESHOLD_HIGH_FAT,
     THRESHOLD_HIGH_SATURATED,
-    CALORIE_CATEGORIES
+    CALORIE_CATEGORIES,
+    CALORIE_CATEGORY_LABELS,
+    MACRONUTRIENT_PROFILE_LABELS
+)
+
+# Límites inferiores de CALORIE_CATEGORIES (rangos contiguos y ordenados)
+# para clasificar por búsqueda binaria en lugar de fila a fila
+_CALORIE_LOWER_BOUNDS = np.array(
+    [min_val for min_val, _ in CALORIE_CATEGORIES.values()], dtype=np.float64
 )
 
 
@@ -31,98 +42,137 @@ class FeatureEngineer:
         Returns:
             DataFrame con ratios añadidos
         """
+        return df.assign(**self._nutritional_ratios_columns(df))
+
+    def create_health_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Crea indicadores booleanos de salud nutricional.
+
+        Args:
+            df: DataFrame con productos
+
+        Returns:
+            DataFrame con indicadores añadidos
+        """
+        return df.assign(**self._health_indicators_columns(df))
+
+    def create_aggregate_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Crea características agregadas de macronutrientes.
+
+        Args:
+            df: DataFrame con productos
+
+        Returns:
+            DataFrame con características agregadas
+        """
+        return df.assign(**self._aggregate_features_columns(df))
+
+    def create_categorical_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Crea características categóricas basadas en rangos.
+
+        Args:
+            df: DataFrame con productos
+
+        Returns:
+            DataFrame con categorías añadidas
+        """
+        return df.assign(**self._categorical_features_columns(df))
+
+    def _nutritional_ratios_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """
+        Calcula los ratios nutricionales sin modificar el DataFrame.
+
+        Args:
+            df: DataFrame con productos (solo lectura)
+
+        Returns:
+            Diccionario nombre de columna → valores calculados
+        """
         self.logger.info("Creando ratios nutricionales")
 
-        # Ratio grasas saturadas / grasas totales
-        if "grasas_saturadas" in df.columns and "grasas_totales" in df.columns:
-            mask = (df["grasas_totales"].notna()) & (df["grasas_totales"] > 0)
-            df.loc[mask, "ratio_grasas_saturadas"] = (
-                df.loc[mask, "grasas_saturadas"] / df.loc[mask, "grasas_totales"]
-            ).round(3)
-
-        # Ratio azúcares / carbohidratos
-        if "azucares" in df.columns and "carbohidratos" in df.columns:
-            mask = (df["carbohidratos"].notna()) & (df["carbohidratos"] > 0)
-            df.loc[mask, "ratio_azucares"] = (
-                df.loc[mask, "azucares"] / df.loc[mask, "carbohidratos"]
-            ).round(3)
-
-        # Ratio proteína / carbohidratos
-        if "proteinas" in df.columns and "carbohidratos" in df.columns:
-            mask = (df["carbohidratos"].notna()) & (df["carbohidratos"] > 0)
-            df.loc[mask, "ratio_proteina_carbohidratos"] = (
-                df.loc[mask, "proteinas"] / df.loc[mask, "carbohidratos"]
-            ).round(3)
-
-        # Ratio proteína / grasas
-        if "proteinas" in df.columns and "grasas_totales" in df.columns:
-            mask = (df["grasas_totales"].notna()) & (df["grasas_totales"] > 0)
-            df.loc[mask, "ratio_proteina_grasas"] = (
-                df.loc[mask, "proteinas"] / df.loc[mask, "grasas_totales"]
-            ).round(3)
+        columns = {}
+
+        # (columna, numerador, denominador)
+        ratios = [
+            ("ratio_grasas_saturadas", "grasas_saturadas", "grasas_totales"),
+            ("ratio_azucares", "azucares", "carbohidratos"),
+            ("ratio_proteina_carbohidratos", "proteinas", "carbohidratos"),
+            ("ratio_proteina_grasas", "proteinas", "grasas_totales"),
+        ]
+
+        for name, numerator, denominator in ratios:
+            if numerator in df.columns and denominator in df.columns:
+                mask = (df[denominator].notna()) & (df[denominator] > 0)
+                columns[name] = (df[numerator] / df[denominator]).where(mask).round(3)
 
         self.logger.info("Ratios nutricionales creados")
 
-        return df
+        return columns
 
-    def create_health_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _health_indicators_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         """
-        Crea indicadores booleanos de salud nutricional.
+        Calcula los indicadores de salud sin modificar el DataFrame.
 
         Args:
-            df: DataFrame con productos
+            df: DataFrame con productos (solo lectura)
 
         Returns:
-            DataFrame con indicadores añadidos
+            Diccionario nombre de columna → valores calculados
         """
         self.logger.info("Creando indicadores de salud")
 
+        columns = {}
+
         # Indicador: tiene fibra
         if "fibra" in df.columns:
-            df["tiene_fibra"] = (df["fibra"].notna()) & (df["fibra"] > 0)
+            columns["tiene_fibra"] = (df["fibra"].notna()) & (df["fibra"] > 0)
 
         # Indicador: alto contenido de sal (>1.5g por 100g)
         if "sal" in df.columns:
-            df["alto_contenido_sal"] = (df["sal"].notna()) & (df["sal"] > THRESHOLD_HIGH_SALT)
+            columns["alto_contenido_sal"] = (df["sal"].notna()) & (df["sal"] > THRESHOLD_HIGH_SALT)
 
         # Indicador: alto contenido de azúcar (>15g por 100g)
         if "azucares" in df.columns:
-            df["alto_contenido_azucar"] = (df["azucares"].notna()) & (df["azucares"] > THRESHOLD_HIGH_SUGAR)
+            columns["alto_contenido_azucar"] = (df["azucares"].notna()) & (df["azucares"] > THRESHOLD_HIGH_SUGAR)
 
         # Indicador: alto contenido de grasas (>17.5g por 100g)
         if "grasas_totales" in df.columns:
-            df["alto_contenido_grasas"] = (df["grasas_totales"].notna()) & (df["grasas_totales"] > THRESHOLD_HIGH_FAT)
+            columns["alto_contenido_grasas"] = (df["grasas_totales"].notna()) & (df["grasas_totales"] > THRESHOLD_HIGH_FAT)
 
         # Indicador: alto contenido de grasas saturadas (>5g por 100g)
         if "grasas_saturadas" in df.columns:
-            df["alto_contenido_grasas_saturadas"] = (
+            columns["alto_contenido_grasas_saturadas"] = (
                 (df["grasas_saturadas"].notna()) & (df["grasas_saturadas"] > THRESHOLD_HIGH_SATURATED)
             )
 
         # Indicador: tiene alérgenos
         if "alergenos" in df.columns:
-            df["tiene_alergenos"] = df["alergenos"].notna() & (df["alergenos"] != "")
+            columns["tiene_alergenos"] = df["alergenos"].notna() & (df["alergenos"] != "")
 
         # Indicador: tiene certificaciones
         if "certificaciones" in df.columns:
-            df["tiene_certificaciones"] = df["certificaciones"].notna() & (df["certificaciones"] != "")
+            columns["tiene_certificaciones"] = df["certificaciones"].notna() & (df["certificaciones"] != "")
 
         self.logger.info("Indicadores de salud creados")
 
-        return df
+        return columns
 
-    def create_aggregate_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _aggregate_features_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         """
-        Crea características agregadas de macronutrientes.
+        Calcula las características agregadas sin modificar el DataFrame.
 
         Args:
-            df: DataFrame con productos
+            df: DataFrame con productos (solo lectura)
 
         Returns:
-            DataFrame con características agregadas
+            Diccionario nombre de columna → valores calculados
         """
         self.logger.info("Creando características agregadas")
 
+        columns = {}
+
         # Suma de macronutrientes
         macro_cols = []
         for col in ["grasas_totales", "carbohidratos", "proteinas", "fibra"]:
@@ -130,84 +180,82 @@ class FeatureEngineer:
                 macro_cols.append(col)
 
         if macro_cols:
-            df["suma_macronutrientes"] = df[macro_cols].sum(axis=1, skipna=True).round(2)
+            columns["suma_macronutrientes"] = df[macro_cols].sum(axis=1, skipna=True).round(2)
 
         # Densidad calórica (ya está en energia_kcal, pero lo hacemos explícito)
         if "energia_kcal" in df.columns:
-            df["densidad_calorica"] = df["energia_kcal"]
+            columns["densidad_calorica"] = df["energia_kcal"]
 
         # Calorías de grasas (1g grasa = 9 kcal)
         if "grasas_totales" in df.columns:
-            df["calorias_de_grasas"] = (df["grasas_totales"] * 9).round(1)
+            columns["calorias_de_grasas"] = (df["grasas_totales"] * 9).round(1)
 
         # Calorías de carbohidratos (1g carbohidrato = 4 kcal)
         if "carbohidratos" in df.columns:
-            df["calorias_de_carbohidratos"] = (df["carbohidratos"] * 4).round(1)
+            columns["calorias_de_carbohidratos"] = (df["carbohidratos"] * 4).round(1)
 
         # Calorías de proteínas (1g proteína = 4 kcal)
         if "proteinas" in df.columns:
-            df["calorias_de_proteinas"] = (df["proteinas"] * 4).round(1)
+            columns["calorias_de_proteinas"] = (df["proteinas"] * 4).round(1)
 
         self.logger.info("Características agregadas creadas")
 
-        return df
+        return columns
 
-    def create_categorical_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _categorical_features_columns(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
         """
-        Crea características categóricas basadas en rangos.
+        Calcula las características categóricas sin modificar el DataFrame.
 
         Args:
-            df: DataFrame con productos
+            df: DataFrame con productos (solo lectura)
 
         Returns:
-            DataFrame con categorías añadidas
+            Diccionario nombre de columna → valores calculados
         """
         self.logger.info("Creando características categóricas")
 
+        columns = {}
+
         # Categoría calórica
         if "energia_kcal" in df.columns:
-            def categorize_calories(kcal):
-                if pd.isna(kcal):
-                    return "desconocido"
-                for category, (min_val, max_val) in CALORIE_CATEGORIES.items():
-                    if min_val <= kcal < max_val:
-                        return category
-                return "muy_alto"
-
-            df["categoria_calorica"] = df["energia_kcal"].apply(categorize_calories)
-
-        # Perfil nutricional (basado en macronutrientes dominantes)
-        if all(col in df.columns for col in ["grasas_totales", "carbohidratos", "proteinas"]):
-            def get_macronutrient_profile(row):
-                if pd.isna(row["grasas_totales"]) or pd.isna(row["carbohidratos"]) or pd.isna(row["proteinas"]):
-                    return "desconocido"
-
-                total = row["grasas_totales"] + row["carbohidratos"] + row["proteinas"]
-                if total == 0:
-                    return "desconocido"
-
-                pct_fat = (row["grasas_totales"] / total) * 100
-                pct_carb = (row["carbohidratos"] / total) * 100
-                pct_protein = (row["proteinas"] / total) * 100
+            kcal = df["energia_kcal"].to_numpy(dtype=np.float64, na_value=np.nan)
+            idx = np.searchsorted(_CALORIE_LOWER_BOUNDS, kcal, side="right") - 1
 
-                max_macro = max(pct_fat, pct_carb, pct_protein)
+            # Valores por debajo del primer rango caen en "muy_alto", como antes
+            codes = np.where(idx >= 0, idx + 1, CALORIE_CATEGORY_LABELS.index("muy_alto"))
+            codes[np.isnan(kcal)] = 0
 
-                if max_macro == pct_fat:
-                    return "alto_en_grasas"
-                elif max_macro == pct_carb:
-                    return "alto_en_carbohidratos"
-                else:
-                    return "alto_en_proteinas"
+            columns["categoria_calorica"] = pd.Series(
+                pd.Categorical.from_codes(codes, categories=CALORIE_CATEGORY_LABELS),
+                index=df.index
+            )
 
-            df["perfil_macronutrientes"] = df.apply(get_macronutrient_profile, axis=1)
+        # Perfil nutricional (basado en macronutrientes dominantes)
+        macro_cols = ["grasas_totales", "carbohidratos", "proteinas"]
+        if all(col in df.columns for col in macro_cols):
+            macros = df[macro_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+            total = macros.sum(axis=1)
+            valid = ~np.isnan(total) & (total != 0)
+
+            # argmax devuelve el primer máximo: en empate gana grasas, luego carbohidratos
+            with np.errstate(invalid="ignore", divide="ignore"):
+                percentages = macros / total[:, None] * 100
+            dominant = np.argmax(np.where(valid[:, None], percentages, 0), axis=1)
+            codes = np.where(valid, dominant + 1, 0)
+
+            columns["perfil_macronutrientes"] = pd.Series(
+                pd.Categorical.from_codes(codes, categories=MACRONUTRIENT_PROFILE_LABELS),
+                index=df.index
+            )
 
         self.logger.info("Características categóricas creadas")
 
-        return df
+        return columns
 
     def create_all_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Ejecuta todas las creaciones de características en orden.
+        Ejecuta todas las creaciones de características y las añade en una
+        sola asignación, evitando copias intermedias del DataFrame.
 
         Args:
             df: DataFrame con productos
@@ -219,17 +267,23 @@ class FeatureEngineer:
 
         initial_columns = len(df.columns)
 
-        # Paso 1: Ratios nutricionales
-        df = self.create_nutritional_ratios(df)
-
-        # Paso 2: Indicadores de salud
-        df = self.create_health_indicators(df)
+        # Las cuatro etapas son independientes entre sí (solo leen df), por lo
+        # que se calculan en hilos paralelos; NumPy libera el GIL en las
+        # operaciones vectorizadas. El orden de las columnas se conserva.
+        builders = (
+            self._nutritional_ratios_columns,    # Paso 1: Ratios nutricionales
+            self._health_indicators_columns,     # Paso 2: Indicadores de salud
+            self._aggregate_features_columns,    # Paso 3: Características agregadas
+            self._categorical_features_columns,  # Paso 4: Características categóricas
+        )
 
-        # Paso 3: Características agregadas
-        df = self.create_aggregate_features(df)
+        new_columns = {}
+        with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+            futures = [executor.submit(builder, df) for builder in builders]
+            for future in futures:
+                new_columns.update(future.result())
 
-        # Paso 4: Características categóricas
-        df = self.create_categorical_features(df)
+        df = df.assign(**new_columns)
 
         final_columns = len(df.columns)
         new_features = final_columns - initial_columns
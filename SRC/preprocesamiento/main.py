@@ -16,7 +16,7 @@ from SRC.preprocesamiento.config import (
     INPUT_CSV, OUTPUT_CSV, LOG_FILE, ENCODING
 )
 from SRC.preprocesamiento.constants import MIN_REQUIRED_NUTRIENTS
-from SRC.preprocesamiento.data_loader import DataLoader, setup_logger
+from SRC.preprocesamiento.data_loader import DataLoader, setup_logger, flush_logger
 from SRC.preprocesamiento.cleaner import DataCleaner
 from SRC.preprocesamiento.normalizer import DataNormalizer
 from SRC.preprocesamiento.validator import DataValidator
@@ -90,8 +90,9 @@ class PreprocessingPipeline:
                 "nutrition_coverage": nutrition_coverage
             }
 
-            self.logger.info(f"Productos cargados: {len(df)}")
-            self.logger.info(f"Columnas: {len(df.columns)}")
+            self.logger.info("Productos cargados: %d", len(df))
+            self.logger.info("Columnas: %d", len(df.columns))
+            flush_logger(self.logger)
 
             # ============================================================
             # ETAPA 2: LIMPIEZA DE DATOS
@@ -104,9 +105,10 @@ class PreprocessingPipeline:
             self.stats["stages"]["cleaning"] = cleaning_report
 
             self.logger.info(
-                f"Productos después de limpieza: {len(df)} "
-                f"(removidos: {cleaning_report['initial_count'] - cleaning_report['final_count']})"
+                "Productos después de limpieza: %d (removidos: %d)",
+                len(df), cleaning_report["initial_count"] - cleaning_report["final_count"]
             )
+            flush_logger(self.logger)
 
             # ============================================================
             # ETAPA 3: NORMALIZACIÓN DE VALORES NUMÉRICOS
@@ -121,7 +123,8 @@ class PreprocessingPipeline:
                 "products_processed": len(df)
             }
 
-            self.logger.info(f"Normalización completada: {len(df)} productos")
+            self.logger.info("Normalización completada: %d productos", len(df))
+            flush_logger(self.logger)
 
             # ============================================================
             # ETAPA 4: VALIDACIÓN DE CALIDAD
@@ -134,11 +137,12 @@ class PreprocessingPipeline:
             self.stats["stages"]["validation"] = validation_report
 
             self.logger.info(
-                f"Validación completada: "
-                f"{validation_report['outliers'].get('total_outliers', 0)} outliers detectados, "
-                f"{validation_report['consistency'].get('total_inconsistent_products', 0)} "
-                f"productos con inconsistencias"
+                "Validación completada: %d outliers detectados, "
+                "%d productos con inconsistencias",
+                validation_report["outliers"].get("total_outliers", 0),
+                validation_report["consistency"].get("total_inconsistent_products", 0)
             )
+            flush_logger(self.logger)
 
             # ============================================================
             # ETAPA 5: INGENIERÍA DE CARACTERÍSTICAS
@@ -157,8 +161,9 @@ class PreprocessingPipeline:
             }
 
             self.logger.info(
-                f"Características creadas: {final_cols - initial_cols} nuevas columnas"
+                "Características creadas: %d nuevas columnas", final_cols - initial_cols
             )
+            flush_logger(self.logger)
 
             # ============================================================
             # ETAPA 6: NORMALIZACIÓN DE TEXTO PARA NLP
@@ -176,8 +181,9 @@ class PreprocessingPipeline:
             self.stats["stages"]["text_normalization"] = text_stats
 
             self.logger.info(
-                f"Campos de texto normalizados: {len(text_stats['fields_processed'])}"
+                "Campos de texto normalizados: %d", len(text_stats["fields_processed"])
             )
+            flush_logger(self.logger)
 
             # ============================================================
             # ETAPA 7: EXPORTACIÓN DE RESULTADOS
@@ -205,37 +211,41 @@ class PreprocessingPipeline:
             self.logger.info("PIPELINE COMPLETADO EXITOSAMENTE")
             self.logger.info("=" * 80)
             self.logger.info(
-                f"Productos: {self.stats['initial_products']} → "
-                f"{self.stats['final_products']} "
-                f"({self.stats['removed_products']} removidos, "
-                f"{round(self.stats['removed_products']/self.stats['initial_products']*100, 1)}%)"
+                "Productos: %d → %d (%d removidos, %s%%)",
+                self.stats["initial_products"],
+                self.stats["final_products"],
+                self.stats["removed_products"],
+                round(self.stats["removed_products"] / self.stats["initial_products"] * 100, 1)
             )
             self.logger.info(
-                f"Columnas: {self.stats['initial_columns']} → {self.stats['final_columns']} "
-                f"(+{self.stats['final_columns'] - self.stats['initial_columns']} características)"
+                "Columnas: %d → %d (+%d características)",
+                self.stats["initial_columns"],
+                self.stats["final_columns"],
+                self.stats["final_columns"] - self.stats["initial_columns"]
             )
             self.logger.info(
-                f"Duración: {self.stats['duration_seconds']:.2f} segundos"
+                "Duración: %.2f segundos", self.stats["duration_seconds"]
             )
-            self.logger.info(f"Archivo CSV: {OUTPUT_CSV}")
-            self.logger.info(f"Log: {LOG_FILE}")
+            self.logger.info("Archivo CSV: %s", OUTPUT_CSV)
+            self.logger.info("Log: %s", LOG_FILE)
             self.logger.info("=" * 80)
+            flush_logger(self.logger)
 
             return self.stats
 
         except Exception as e:
-            self.logger.error(f"Error en el pipeline: {e}", exc_info=True)
+            self.logger.error("Error en el pipeline: %s", e, exc_info=True)
             raise
 
     def _save_csv(self, df):
         """Guarda el DataFrame en formato CSV."""
-        self.logger.info(f"Guardando CSV en: {OUTPUT_CSV}")
+        self.logger.info("Guardando CSV en: %s", OUTPUT_CSV)
 
         OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
         df.to_csv(OUTPUT_CSV, index=False, encoding=ENCODING)
 
         self.logger.info(
-            f"CSV guardado: {len(df)} filas, {len(df.columns)} columnas"
+            "CSV guardado: %d filas, %d columnas", len(df), len(df.columns)
         )
 
 
@@ -3,15 +3,23 @@ Normalización de valores: unidades, precios, rangos nutricionales.
 """
 
 import logging
+import numpy as np
 import pandas as pd
+from typing import List, Tuple
 
 from .constants import (
     CONVERSION_FACTORS,
     VALID_WEIGHT_UNITS,
     VALID_VOLUME_UNITS,
-    NUTRITIONAL_FIELDS
+    NUTRITIONAL_FIELDS,
+    PRICE_FIELDS
 )
 
+# Tipo de unidad en la tabla de consulta _kind_lut
+_UNIT_KIND_UNKNOWN = 0
+_UNIT_KIND_WEIGHT = 1
+_UNIT_KIND_VOLUME = 2
+
 
 class DataNormalizer:
     """Normaliza valores en DataFrames de productos."""
@@ -20,6 +28,21 @@ class DataNormalizer:
         """Inicializa el normalizador de datos."""
         self.logger = logging.getLogger(__name__)
 
+        # Tablas de consulta indexadas por código categórico de la unidad
+        self._unit_categories = list(CONVERSION_FACTORS.keys())
+        self._factor_lut = np.array(
+            [CONVERSION_FACTORS[unit] for unit in self._unit_categories], dtype=np.float64
+        )
+        self._kind_lut = np.array(
+            [
+                _UNIT_KIND_WEIGHT if unit in VALID_WEIGHT_UNITS
+                else _UNIT_KIND_VOLUME if unit in VALID_VOLUME_UNITS
+                else _UNIT_KIND_UNKNOWN
+                for unit in self._unit_categories
+            ],
+            dtype=np.int8
+        )
+
     def normalize_weight_volume_units(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Normaliza unidades de peso/volumen a gramos/mililitros base.
@@ -36,36 +59,11 @@ class DataNormalizer:
             self.logger.warning("Columnas de peso/volumen no encontradas")
             return df
 
-        normalized_count = 0
-
-        # Iterar por cada fila y normalizar
-        for idx in df.index:
-            value = df.at[idx, "weight_volume_clean"]
-            unit = df.at[idx, "weight_unit"]
-
-            # Saltar si falta valor o unidad
-            if pd.isna(value) or pd.isna(unit):
-                continue
-
-            unit_lower = str(unit).lower().strip()
-
-            # Verificar si la unidad es válida y convertir
-            if unit_lower in CONVERSION_FACTORS:
-                factor = CONVERSION_FACTORS[unit_lower]
+        value = self._to_float_array(df["weight_volume_clean"], copy=False)
+        value, mask_weight, mask_volume = self._convert_units(value, df["weight_unit"])
 
-                # Normalizar a g o ml según el tipo de unidad original
-                if unit_lower in VALID_WEIGHT_UNITS:
-                    df.at[idx, "weight_volume_clean"] = float(value) * factor
-                    df.at[idx, "weight_unit"] = "g"
-                    normalized_count += 1
-                elif unit_lower in VALID_VOLUME_UNITS:
-                    df.at[idx, "weight_volume_clean"] = float(value) * factor
-                    df.at[idx, "weight_unit"] = "ml"
-                    normalized_count += 1
-            else:
-                self.logger.debug(f"Unidad desconocida: '{unit}' en índice {idx}")
-
-        self.logger.info(f"Unidades normalizadas en {normalized_count} productos")
+        df["weight_volume_clean"] = value
+        self._write_base_units(df, mask_weight, mask_volume)
 
         return df
 
@@ -81,28 +79,11 @@ class DataNormalizer:
         """
         self.logger.info("Normalizando precios")
 
-        price_cols = ["precio_total", "precio_por_cantidad"]
-
-        for col in price_cols:
+        for col in PRICE_FIELDS:
             if col not in df.columns:
                 continue
 
-            # Convertir a numérico
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-            # Establecer valores negativos como NaN
-            negative_mask = df[col] < 0
-            negative_count = negative_mask.sum()
-
-            if negative_count > 0:
-                self.logger.warning(
-                    f"Encontrados {negative_count} precios negativos en '{col}', "
-                    f"se establecen como NaN"
-                )
-                df.loc[negative_mask, col] = pd.NA
-
-            # Redondear a 2 decimales
-            df[col] = df[col].round(2)
+            df[col] = self._clean_prices(self._to_float_array(df[col]), col)
 
         self.logger.info("Normalización de precios completada")
 
@@ -126,25 +107,16 @@ class DataNormalizer:
             self.logger.warning("Faltan columnas necesarias para calcular precio unitario")
             return df
 
-        # Identificar productos sin precio_por_cantidad pero con precio_total y peso
-        mask = (
-            df["precio_por_cantidad"].isna() &
-            df["precio_total"].notna() &
-            df["weight_volume_clean"].notna() &
-            (df["weight_volume_clean"] > 0)
-        )
+        precio_por_cantidad = self._to_float_array(df["precio_por_cantidad"])
 
-        calculated_count = mask.sum()
+        calculated_count = self._fill_precio_unitario(
+            self._to_float_array(df["precio_total"], copy=False),
+            precio_por_cantidad,
+            self._to_float_array(df["weight_volume_clean"], copy=False)
+        )
 
         if calculated_count > 0:
-            # Calcular precio por 100g o 100ml
-            df.loc[mask, "precio_por_cantidad"] = (
-                (df.loc[mask, "precio_total"] / df.loc[mask, "weight_volume_clean"]) * 100
-            ).round(2)
-
-            self.logger.info(f"Precio unitario calculado para {calculated_count} productos")
-        else:
-            self.logger.info("No hay productos para calcular precio unitario")
+            df["precio_por_cantidad"] = precio_por_cantidad
 
         return df
 
@@ -162,19 +134,14 @@ class DataNormalizer:
 
         if "weight_volume_clean" not in df.columns or "weight_unit" not in df.columns:
             self.logger.warning("Columnas de peso/volumen no encontradas")
-            df["peso_en_kg"] = pd.NA
+            df["peso_en_kg"] = np.full(len(df), np.nan, dtype=np.float64)
             return df
 
-        # Crear columna peso_en_kg
-        df["peso_en_kg"] = pd.NA
-
-        # Para unidades de peso en gramos
-        mask_g = (df["weight_unit"] == "g") & df["weight_volume_clean"].notna()
-        df.loc[mask_g, "peso_en_kg"] = (df.loc[mask_g, "weight_volume_clean"] / 1000).round(3)
-
-        # Para unidades de volumen en ml (aproximación: 1ml ≈ 1g)
-        mask_ml = (df["weight_unit"] == "ml") & df["weight_volume_clean"].notna()
-        df.loc[mask_ml, "peso_en_kg"] = (df.loc[mask_ml, "weight_volume_clean"] / 1000).round(3)
+        # Unidades base g y ml en una sola máscara (aproximación: 1ml ≈ 1g)
+        is_base_unit = df["weight_unit"].isin(("g", "ml")).to_numpy()
+        df["peso_en_kg"] = self._peso_en_kg(
+            self._to_float_array(df["weight_volume_clean"], copy=False), is_base_unit
+        )
 
         non_null_count = df["peso_en_kg"].notna().sum()
         self.logger.info(f"Campo peso_en_kg añadido para {non_null_count} productos")
@@ -195,20 +162,8 @@ class DataNormalizer:
 
         nutrition_cols = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
 
-        for col in nutrition_cols:
-            # Convertir a numérico
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-            # Establecer valores negativos como NaN
-            negative_mask = df[col] < 0
-            negative_count = negative_mask.sum()
-
-            if negative_count > 0:
-                self.logger.warning(
-                    f"Encontrados {negative_count} valores negativos en '{col}', "
-                    f"se establecen como NaN"
-                )
-                df.loc[negative_mask, col] = pd.NA
+        if nutrition_cols:
+            df[nutrition_cols] = self._validate_nutrition_block(df, nutrition_cols)
 
         self.logger.info("Validación de valores nutricionales completada")
 
@@ -226,27 +181,282 @@ class DataNormalizer:
         """
         self.logger.info("Iniciando normalización completa")
 
-        initial_count = len(df)
+        df = self._normalize_all_fused(df)
+
+        final_count = len(df)
+
+        self.logger.info(
+            f"Normalización completada. Productos procesados: {final_count}"
+        )
+
+        return df
+
+    def _normalize_all_fused(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica los cinco pasos de normalize_all en una sola pasada: cada columna
+        se extrae una vez a NumPy, se transforma y se escribe de vuelta una vez.
+
+        Args:
+            df: DataFrame con productos
+
+        Returns:
+            DataFrame normalizado
+        """
+        has_weight = "weight_volume_clean" in df.columns and "weight_unit" in df.columns
+        has_prices = {col: col in df.columns for col in PRICE_FIELDS}
+        nutrition_cols = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
+
+        weight_volume = None
+        mask_weight = mask_volume = None
+        prices = {}
 
         # Paso 1: Normalizar unidades de peso/volumen
-        df = self.normalize_weight_volume_units(df)
+        if has_weight:
+            weight_volume = self._to_float_array(df["weight_volume_clean"], copy=False)
+            weight_volume, mask_weight, mask_volume = self._convert_units(
+                weight_volume, df["weight_unit"]
+            )
+        else:
+            self.logger.warning("Columnas de peso/volumen no encontradas")
 
         # Paso 2: Normalizar precios
-        df = self.normalize_prices(df)
+        for col, present in has_prices.items():
+            if present:
+                prices[col] = self._clean_prices(self._to_float_array(df[col]), col)
 
         # Paso 3: Validar valores nutricionales
-        df = self.validate_nutritional_values(df)
-
-        # Paso 4: Calcular precio unitario
-        df = self.calculate_precio_unitario(df)
-
-        # Paso 5: Añadir peso en kg
-        df = self.add_peso_en_kg(df)
+        nutrition = None
+        if nutrition_cols:
+            nutrition = self._validate_nutrition_block(df, nutrition_cols)
+
+        # Paso 4: Calcular precio unitario (no necesita weight_unit)
+        if "weight_volume_clean" in df.columns and all(has_prices.values()):
+            if weight_volume is None:
+                weight_volume = self._to_float_array(df["weight_volume_clean"], copy=False)
+            self._fill_precio_unitario(
+                prices["precio_total"], prices["precio_por_cantidad"], weight_volume
+            )
+        else:
+            self.logger.warning("Faltan columnas necesarias para calcular precio unitario")
 
-        final_count = len(df)
+        # Paso 5: Peso en kg (solo unidades base g/ml tras la conversión)
+        if has_weight:
+            peso_en_kg = self._peso_en_kg(weight_volume, mask_weight | mask_volume)
+        else:
+            peso_en_kg = np.full(len(df), np.nan, dtype=np.float64)
+
+        # Escritura única de cada columna
+        if has_weight:
+            df["weight_volume_clean"] = weight_volume
+            self._write_base_units(df, mask_weight, mask_volume)
+        for col, values in prices.items():
+            df[col] = values
+        if nutrition is not None:
+            df[nutrition_cols] = nutrition
+        df["peso_en_kg"] = peso_en_kg
 
         self.logger.info(
-            f"Normalización completada. Productos procesados: {final_count}"
+            f"Campo peso_en_kg añadido para {int((~np.isnan(peso_en_kg)).sum())} productos"
         )
 
         return df
+
+    @staticmethod
+    def _to_float_array(series: pd.Series, copy: bool = True) -> np.ndarray:
+        """
+        Convierte una columna a un array float64 (valores inválidos a NaN).
+
+        Args:
+            series: Columna a convertir
+            copy: Si True, devuelve un array propio y escribible; si False puede
+                devolver una vista de solo lectura (para columnas que solo se leen)
+
+        Returns:
+            Array float64
+        """
+        return pd.to_numeric(series, errors="coerce").to_numpy(
+            dtype=np.float64, na_value=np.nan, copy=copy
+        )
+
+    def _convert_units(
+        self,
+        value: np.ndarray,
+        unit: pd.Series
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Convierte valores de peso/volumen a g o ml según su unidad.
+
+        Args:
+            value: Valores de peso/volumen
+            unit: Unidades originales
+
+        Returns:
+            Tupla (valores convertidos, máscara de peso, máscara de volumen)
+        """
+        unit_lower = unit.astype("string").str.lower().str.strip()
+
+        # Código de cada unidad en la tabla de consulta (-1 = ausente o desconocida)
+        codes = pd.Categorical(unit_lower, categories=self._unit_categories).codes
+        known = codes >= 0
+        has_value = ~np.isnan(value)
+
+        # Saltar filas sin valor o sin unidad
+        mask = known & has_value
+        kinds = self._kind_lut[codes]
+        mask_weight = mask & (kinds == _UNIT_KIND_WEIGHT)
+        mask_volume = mask & (kinds == _UNIT_KIND_VOLUME)
+
+        converted = value.copy()
+        converted[mask] = value[mask] * self._factor_lut[codes[mask]]
+
+        unknown_mask = ~known & has_value & unit_lower.notna().to_numpy()
+        # El listado de unidades solo se construye si DEBUG está activo
+        if self.logger.isEnabledFor(logging.DEBUG) and unknown_mask.any():
+            self.logger.debug(
+                "Unidades desconocidas en %d productos: %s",
+                int(unknown_mask.sum()),
+                sorted(unit[unknown_mask].astype(str).unique())
+            )
+
+        self.logger.info(f"Unidades normalizadas en {int(mask.sum())} productos")
+
+        return converted, mask_weight, mask_volume
+
+    @staticmethod
+    def _write_base_units(
+        df: pd.DataFrame,
+        mask_weight: np.ndarray,
+        mask_volume: np.ndarray
+    ) -> None:
+        """
+        Escribe las unidades base (g/ml) de las filas convertidas.
+        Solo se escribe si alguna fila cambia: una columna de unidades vacía
+        se lee como float64 y no admite asignar cadenas.
+
+        Args:
+            df: DataFrame con productos
+            mask_weight: Filas convertidas a gramos
+            mask_volume: Filas convertidas a mililitros
+        """
+        if mask_weight.any():
+            df.loc[mask_weight, "weight_unit"] = "g"
+        if mask_volume.any():
+            df.loc[mask_volume, "weight_unit"] = "ml"
+
+    def _drop_negatives(self, values: np.ndarray, col: str, label: str) -> None:
+        """
+        Establece como NaN (in situ) los valores negativos.
+
+        Args:
+            values: Valores de la columna
+            col: Nombre de la columna (para el log)
+            label: Tipo de valor (para el log)
+        """
+        negative_mask = values < 0
+        negative_count = int(negative_mask.sum())
+
+        if negative_count > 0:
+            self.logger.warning(
+                f"Encontrados {negative_count} {label} negativos en '{col}', "
+                f"se establecen como NaN"
+            )
+            values[negative_mask] = np.nan
+
+    def _validate_nutrition_block(self, df: pd.DataFrame, nutrition_cols: List[str]) -> np.ndarray:
+        """
+        Convierte las columnas nutricionales a numérico y anula los negativos,
+        en un único bloque 2D en lugar de columna a columna.
+
+        Args:
+            df: DataFrame con productos
+            nutrition_cols: Columnas nutricionales presentes
+
+        Returns:
+            Array (filas x columnas) con los valores validados
+        """
+        block = df[nutrition_cols].apply(pd.to_numeric, errors="coerce")
+        values = block.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+
+        negative_mask = values < 0
+        negative_counts = negative_mask.sum(axis=0)
+        values[negative_mask] = np.nan
+
+        for col, negative_count in zip(nutrition_cols, negative_counts):
+            if negative_count > 0:
+                self.logger.warning(
+                    f"Encontrados {negative_count} valores negativos en '{col}', "
+                    f"se establecen como NaN"
+                )
+
+        return values
+
+    def _clean_prices(self, values: np.ndarray, col: str) -> np.ndarray:
+        """
+        Elimina precios negativos y redondea a 2 decimales.
+
+        Args:
+            values: Precios de la columna
+            col: Nombre de la columna
+
+        Returns:
+            Precios normalizados
+        """
+        # Una reducción (fmin ignora NaN) evita la máscara si no hay negativos
+        if np.fmin.reduce(values, initial=np.inf) < 0:
+            self._drop_negatives(values, col, "precios")
+
+        return np.round(values, 2)
+
+    def _fill_precio_unitario(
+        self,
+        precio_total: np.ndarray,
+        precio_por_cantidad: np.ndarray,
+        weight_volume: np.ndarray
+    ) -> int:
+        """
+        Rellena (in situ) el precio por 100g/100ml donde falta.
+
+        Args:
+            precio_total: Precios totales
+            precio_por_cantidad: Precios por cantidad (se modifica)
+            weight_volume: Peso/volumen en g o ml
+
+        Returns:
+            Número de precios calculados
+        """
+        # Identificar productos sin precio_por_cantidad pero con precio_total y peso
+        with np.errstate(invalid="ignore"):
+            mask = (
+                np.isnan(precio_por_cantidad) &
+                ~np.isnan(precio_total) &
+                ~np.isnan(weight_volume) &
+                (weight_volume > 0)
+            )
+
+        calculated_count = int(mask.sum())
+
+        if calculated_count > 0:
+            # Calcular precio por 100g o 100ml
+            precio_por_cantidad[mask] = np.round(
+                precio_total[mask] / weight_volume[mask] * 100, 2
+            )
+            self.logger.info(f"Precio unitario calculado para {calculated_count} productos")
+        else:
+            self.logger.info("No hay productos para calcular precio unitario")
+
+        return calculated_count
+
+    @staticmethod
+    def _peso_en_kg(weight_volume: np.ndarray, is_base_unit: np.ndarray) -> np.ndarray:
+        """
+        Calcula el peso en kg para valores en g o ml (aproximación: 1ml ≈ 1g).
+
+        Args:
+            weight_volume: Peso/volumen en g o ml
+            is_base_unit: Máscara de filas cuya unidad es g o ml
+
+        Returns:
+            Array float64 con el peso en kg (NaN donde no aplica)
+        """
+        mask = is_base_unit & ~np.isnan(weight_volume)
+        return np.where(mask, np.round(weight_volume / 1000, 3), np.nan)
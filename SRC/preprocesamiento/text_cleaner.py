@@ -5,13 +5,15 @@ Maneja normalización Unicode, eliminación de caracteres especiales y patrones.
 
 import re
 import logging
+import functools
 import unicodedata
 import pandas as pd
 from typing import Optional
 
 from .constants import (
     SPECIAL_CHARS_TO_REMOVE,
-    PATTERNS_TO_CLEAN
+    PATTERNS_TO_CLEAN,
+    CLEAN_TEXT_CACHE_SIZE
 )
 
 
@@ -23,12 +25,29 @@ class TextCleaner:
         self.logger = logging.getLogger(__name__)
 
         # Compilar patrones regex para eficiencia
+        self._whitespace_pattern = re.compile(r'\s+')
         self.special_chars_pattern = re.compile(SPECIAL_CHARS_TO_REMOVE)
+        self._special_chars_pattern_keep_numbers = re.compile(r'[^\w\sáéíóúüñÁÉÍÓÚÜÑ0-9]')
+
+        # Pasos 4 y 5 de clean_text fusionados: cada tramo de caracteres especiales
+        # y espacios se sustituye por un único espacio en una sola pasada
+        self._special_or_space_pattern = re.compile(
+            f"(?:{self.special_chars_pattern.pattern}|\\s)+"
+        )
+        self._special_or_space_pattern_keep_numbers = re.compile(
+            f"(?:{self._special_chars_pattern_keep_numbers.pattern}|\\s)+"
+        )
         self.compiled_patterns = {
             re.compile(pattern): replacement
             for pattern, replacement in PATTERNS_TO_CLEAN.items()
         }
 
+        # Caché por instancia de clean_text: los campos categóricos repiten
+        # un vocabulario pequeño de valores
+        self._clean_text_cached = functools.lru_cache(maxsize=CLEAN_TEXT_CACHE_SIZE)(
+            self._clean_text_uncached
+        )
+
     def normalize_unicode(self, text: str) -> str:
         """
         Normaliza caracteres Unicode manteniendo acentos del español.
@@ -42,6 +61,10 @@ class TextCleaner:
         if not isinstance(text, str) or not text.strip():
             return ""
 
+        # El texto ASCII ya está en forma NFC
+        if text.isascii():
+            return text
+
         # Normalizar a forma NFC (Canonical Decomposition, followed by Canonical Composition)
         # Esto mantiene los acentos pero normaliza variantes Unicode
         text = unicodedata.normalize('NFC', text)
@@ -62,7 +85,7 @@ class TextCleaner:
             return ""
 
         # Múltiples espacios a uno solo
-        text = re.sub(r'\s+', ' ', text)
+        text = self._whitespace_pattern.sub(' ', text)
 
         # Eliminar espacios al inicio y final
         text = text.strip()
@@ -85,7 +108,7 @@ class TextCleaner:
 
         if keep_numbers:
             # Mantener letras, números, espacios y acentos
-            pattern = re.compile(r'[^\w\sáéíóúüñÁÉÍÓÚÜÑ0-9]')
+            pattern = self._special_chars_pattern_keep_numbers
         else:
             # Solo letras, espacios y acentos
             pattern = self.special_chars_pattern
@@ -107,7 +130,8 @@ class TextCleaner:
         if not isinstance(text, str) or not text.strip():
             return ""
 
-        # Aplicar todos los patrones compilados
+        # Aplicar cada patrón en orden: los de cantidades se solapan ("6x100 g")
+        # y el resultado depende de la secuencia
         for pattern, replacement in self.compiled_patterns.items():
             text = pattern.sub(replacement, text)
 
@@ -157,6 +181,22 @@ class TextCleaner:
         if not text:
             return ""
 
+        return self._clean_text_cached(
+            text, lowercase, remove_patterns, remove_special_chars, keep_numbers
+        )
+
+    def _clean_text_uncached(
+        self,
+        text: str,
+        lowercase: bool,
+        remove_patterns: bool,
+        remove_special_chars: bool,
+        keep_numbers: bool
+    ) -> str:
+        """
+        Pasos de limpieza de clean_text sobre un texto ya validado (str no vacío).
+        Se invoca a través de la caché LRU _clean_text_cached.
+        """
         # Paso 1: Normalizar Unicode
         text = self.normalize_unicode(text)
 
@@ -168,15 +208,80 @@ class TextCleaner:
         if remove_patterns:
             text = self.remove_patterns(text)
 
-        # Paso 4: Eliminar caracteres especiales
-        if remove_special_chars:
-            text = self.remove_special_characters(text, keep_numbers=keep_numbers)
-
-        # Paso 5: Limpiar espacios en blanco
-        text = self.remove_extra_whitespace(text)
+        # Pasos 4 y 5: Eliminar caracteres especiales y limpiar espacios en blanco
+        pattern = self._final_cleanup_pattern(remove_special_chars, keep_numbers)
+        text = pattern.sub(' ', text).strip()
 
         return text
 
+    def _final_cleanup_pattern(self, remove_special_chars: bool, keep_numbers: bool) -> re.Pattern:
+        """
+        Patrón que aplica en una pasada la eliminación de caracteres especiales
+        (si procede) y la compactación de espacios.
+
+        Args:
+            remove_special_chars: Eliminar caracteres especiales
+            keep_numbers: Mantener números en el texto
+
+        Returns:
+            Patrón compilado cuyas coincidencias se sustituyen por un espacio
+        """
+        if not remove_special_chars:
+            return self._whitespace_pattern
+        if keep_numbers:
+            return self._special_or_space_pattern_keep_numbers
+        return self._special_or_space_pattern
+
+    def _clean_series(
+        self,
+        series: pd.Series,
+        lowercase: bool = True,
+        remove_patterns: bool = True,
+        remove_special_chars: bool = True,
+        keep_numbers: bool = False
+    ) -> pd.Series:
+        """
+        Versión vectorizada de clean_text sobre una columna completa.
+        Aplica los mismos pasos con métodos .str en lugar de una llamada por fila.
+
+        Args:
+            series: Columna a limpiar
+            lowercase: Convertir a minúsculas
+            remove_patterns: Eliminar patrones específicos
+            remove_special_chars: Eliminar caracteres especiales
+            keep_numbers: Mantener números en el texto
+
+        Returns:
+            Serie con el texto limpio ("" para valores nulos o no textuales)
+        """
+        # Igual que clean_text: los valores que no son str se convierten en ""
+        # (también en columnas numéricas o categóricas, no solo de tipo object)
+        if not isinstance(series.dtype, pd.StringDtype):
+            is_str = [isinstance(x, str) for x in series]
+            series = series.astype(object).where(is_str)
+
+        s = series.fillna("").astype(str).str.strip()
+
+        # Paso 1: Normalizar Unicode (solo textos no ASCII; el ASCII ya está en NFC)
+        non_ascii = ~s.map(str.isascii).astype(bool)
+        if non_ascii.any():
+            s = s.mask(non_ascii, s[non_ascii].str.normalize('NFC'))
+
+        # Paso 2: Convertir a minúsculas
+        if lowercase:
+            s = s.str.lower()
+
+        # Paso 3: Eliminar patrones específicos
+        if remove_patterns:
+            for pattern, replacement in self.compiled_patterns.items():
+                s = s.str.replace(pattern, replacement, regex=True)
+
+        # Pasos 4 y 5: Eliminar caracteres especiales y limpiar espacios en blanco
+        pattern = self._final_cleanup_pattern(remove_special_chars, keep_numbers)
+        s = s.str.replace(pattern, ' ', regex=True).str.strip()
+
+        return s
+
     def clean_categorical_field(self, text: str, separator: str = ",") -> str:
         """
         Limpia campos categóricos que contienen listas separadas por comas.
@@ -246,9 +351,7 @@ class TextCleaner:
         if is_categorical:
             df[output_column] = df[column].apply(self.clean_categorical_field)
         else:
-            df[output_column] = df[column].apply(
-                lambda x: self.clean_text(x, **clean_kwargs)
-            )
+            df[output_column] = self._clean_series(df[column], **clean_kwargs)
 
         # Contar valores procesados
         non_empty = df[output_column].notna() & (df[output_column] != "")
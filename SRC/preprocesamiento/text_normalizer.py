@@ -3,18 +3,65 @@ Orquestador de normalización de texto para NLP.
 Combina limpieza de texto y tokenización para crear campos normalizados.
 """
 
+import os
 import logging
 import pandas as pd
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 
 from .text_cleaner import TextCleaner
 from .tokenizer import TextTokenizer
 from .constants import (
     TEXT_FIELDS_TO_NORMALIZE,
     CATEGORICAL_TEXT_FIELDS,
-    TEXT_NORMALIZED_SUFFIX
+    TEXT_NORMALIZED_SUFFIX,
+    TEXT_NORMALIZATION_WORKERS,
+    PARALLEL_TEXT_NORMALIZATION_MIN_ROWS
 )
 
+# Opciones de limpieza usadas para todos los campos de texto
+_CLEAN_OPTIONS = {
+    "lowercase": True,
+    "remove_patterns": True,
+    "remove_special_chars": True,
+    "keep_numbers": False
+}
+
+# TextCleaner propio de cada proceso worker (creado en _init_clean_worker)
+_worker_cleaner = None
+
+
+def _init_clean_worker():
+    """Inicializa el TextCleaner del proceso worker una sola vez."""
+    global _worker_cleaner
+    _worker_cleaner = TextCleaner()
+
+
+def _clean_column_worker(series: pd.Series, is_categorical: bool) -> pd.Series:
+    """
+    Limpia una columna en un proceso worker.
+
+    Args:
+        series: Columna a limpiar
+        is_categorical: Si es un campo categórico con separadores
+
+    Returns:
+        Columna limpia, o la excepción producida al limpiarla
+    """
+    # Los errores del campo se devuelven en lugar de lanzarse, para
+    # distinguirlos de los fallos del pool (que activan la vía secuencial)
+    try:
+        df = _worker_cleaner.clean_dataframe_column(
+            df=series.to_frame(),
+            column=series.name,
+            is_categorical=is_categorical,
+            overwrite=True,
+            **_CLEAN_OPTIONS
+        )
+    except Exception as e:
+        return e
+    return df[series.name]
+
 
 class TextNormalizer:
     """Normaliza campos de texto para análisis NLP."""
@@ -66,10 +113,36 @@ class TextNormalizer:
             self.logger.warning(f"Campo '{field}' no encontrado, se omite")
             return df
 
-        self.logger.info(f"Normalizando campo: {field}")
+        return self._normalize_field(
+            df=df,
+            field=field,
+            is_categorical=field in CATEGORICAL_TEXT_FIELDS,
+            apply_tokenization=apply_tokenization,
+            overwrite=overwrite
+        )
 
-        # Determinar si es un campo categórico
-        is_categorical = field in CATEGORICAL_TEXT_FIELDS
+    def _normalize_field(
+        self,
+        df: pd.DataFrame,
+        field: str,
+        is_categorical: bool,
+        apply_tokenization: bool,
+        overwrite: bool
+    ) -> pd.DataFrame:
+        """
+        Normaliza un campo que ya se sabe presente en el DataFrame.
+
+        Args:
+            df: DataFrame con los datos
+            field: Nombre del campo a normalizar
+            is_categorical: Si es un campo categórico con separadores
+            apply_tokenization: Si True, aplica tokenización y stopwords
+            overwrite: Si True, sobrescribe la columna original con texto limpio
+
+        Returns:
+            DataFrame con el campo normalizado
+        """
+        self.logger.info(f"Normalizando campo: {field}")
 
         # Paso 1: Limpieza básica de texto (sobrescribe la columna original)
         df = self.text_cleaner.clean_dataframe_column(
@@ -77,12 +150,32 @@ class TextNormalizer:
             column=field,
             is_categorical=is_categorical,
             overwrite=overwrite,
-            lowercase=True,
-            remove_patterns=True,
-            remove_special_chars=True,
-            keep_numbers=False
+            **_CLEAN_OPTIONS
         )
 
+        return self._finish_field(df, field, apply_tokenization, overwrite)
+
+    def _finish_field(
+        self,
+        df: pd.DataFrame,
+        field: str,
+        apply_tokenization: bool,
+        overwrite: bool = True
+    ) -> pd.DataFrame:
+        """
+        Completa la normalización de un campo ya limpio: estadísticas y
+        tokenización opcional.
+
+        Args:
+            df: DataFrame con el campo ya limpio
+            field: Nombre del campo
+            apply_tokenization: Si True, aplica tokenización y stopwords
+            overwrite: Si True, la columna del campo contiene el texto limpio
+                (en minúsculas)
+
+        Returns:
+            DataFrame con el campo normalizado
+        """
         # Contar valores limpiados
         cleaned_count = (df[field].notna() & (df[field] != "")).sum()
         self.stats["total_values_cleaned"] += cleaned_count
@@ -94,7 +187,8 @@ class TextNormalizer:
                 column=field,
                 output_column=f"{field}_tokenized",
                 remove_stopwords=True,
-                apply_stemming=True
+                apply_stemming=True,
+                tokens_are_lower=overwrite
             )
 
             # Contar valores tokenizados
@@ -108,21 +202,60 @@ class TextNormalizer:
 
         return df
 
+    def _clean_fields_parallel(
+        self,
+        df: pd.DataFrame,
+        fields: Dict[str, bool],
+        max_workers: int
+    ) -> Dict[str, object]:
+        """
+        Limpia varias columnas en paralelo, una por proceso worker.
+
+        Args:
+            df: DataFrame con los datos
+            fields: Campos a limpiar (existentes en df) → si son categóricos
+            max_workers: Número máximo de procesos
+
+        Returns:
+            Diccionario campo → columna limpia (o la excepción producida al
+            limpiarla en el worker)
+        """
+        self.logger.info(f"Limpiando {len(fields)} campos en {max_workers} procesos")
+
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_clean_worker
+        ) as executor:
+            futures = {
+                field: executor.submit(_clean_column_worker, df[field], is_categorical)
+                for field, is_categorical in fields.items()
+            }
+            # Un fallo del pool (BrokenProcessPool, errores de pickling) se propaga
+            for field, future in futures.items():
+                results[field] = future.result()
+
+        return results
+
     def normalize_all_fields(
         self,
         df: pd.DataFrame,
         fields: List[str] = None,
         apply_tokenization: bool = False,
-        overwrite: bool = True
+        overwrite: bool = True,
+        max_workers: Optional[int] = TEXT_NORMALIZATION_WORKERS
     ) -> pd.DataFrame:
         """
         Normaliza todos los campos de texto especificados.
+        Con muchas filas, la limpieza de los campos se reparte entre procesos
+        (un campo por tarea).
 
         Args:
             df: DataFrame con los datos
             fields: Lista de campos a normalizar (None usa TEXT_FIELDS_TO_NORMALIZE)
             apply_tokenization: Si True, aplica tokenización (crea columnas adicionales)
             overwrite: Si True, sobrescribe las columnas originales
+            max_workers: Procesos para la limpieza (None usa os.cpu_count(); 1 = secuencial)
 
         Returns:
             DataFrame con todos los campos normalizados
@@ -136,7 +269,10 @@ class TextNormalizer:
             fields = TEXT_FIELDS_TO_NORMALIZE
 
         # Filtrar solo campos que existen en el DataFrame
-        existing_fields = [field for field in fields if field in df.columns]
+        col_set = set(df.columns)
+        cat_set = set(CATEGORICAL_TEXT_FIELDS)
+        existing_fields = [field for field in fields if field in col_set]
+        is_categorical = {field: field in cat_set for field in existing_fields}
 
         self.logger.info(f"Campos a normalizar: {len(existing_fields)}")
         self.logger.info(f"Campos: {', '.join(existing_fields)}")
@@ -151,21 +287,54 @@ class TextNormalizer:
             "final_columns": 0
         }
 
-        # Normalizar cada campo
-        for field in existing_fields:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(existing_fields))
+
+        cleaned = None
+        if max_workers > 1 and len(df) >= PARALLEL_TEXT_NORMALIZATION_MIN_ROWS:
             try:
-                df = self.normalize_field(
-                    df=df,
-                    field=field,
-                    apply_tokenization=apply_tokenization,
-                    overwrite=overwrite
-                )
+                cleaned = self._clean_fields_parallel(df, is_categorical, max_workers)
             except Exception as e:
-                self.logger.error(
-                    f"Error normalizando campo '{field}': {e}",
-                    exc_info=True
+                self.logger.warning(
+                    "Error en limpieza paralela: %s. Procesando secuencialmente.", e
                 )
-                continue
+
+        if cleaned is not None:
+            for field in existing_fields:
+                try:
+                    result = cleaned[field]
+                    if isinstance(result, Exception):
+                        raise result
+
+                    self.logger.info(f"Normalizando campo: {field}")
+                    output_column = field if overwrite else f"{field}{TEXT_NORMALIZED_SUFFIX}"
+                    df[output_column] = result
+
+                    df = self._finish_field(df, field, apply_tokenization, overwrite)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error normalizando campo '{field}': {e}",
+                        exc_info=True
+                    )
+                    continue
+        else:
+            # Normalizar cada campo
+            for field in existing_fields:
+                try:
+                    df = self._normalize_field(
+                        df=df,
+                        field=field,
+                        is_categorical=is_categorical[field],
+                        apply_tokenization=apply_tokenization,
+                        overwrite=overwrite
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        f"Error normalizando campo '{field}': {e}",
+                        exc_info=True
+                    )
+                    continue
 
         # Actualizar estadísticas finales
         self.stats["final_columns"] = len(df.columns)
@@ -244,13 +413,16 @@ class TextNormalizer:
 
         self.logger.info(f"Combinando {len(columns_to_combine)} columnas")
 
-        # Combinar campos con espacios
-        df[output_column] = df[columns_to_combine].apply(
-            lambda row: " ".join(
-                str(val) for val in row if pd.notna(val) and str(val).strip()
-            ),
-            axis=1
-        )
+        # Combinar campos con espacios, columna a columna (sin construir una Serie por fila)
+        combined = pd.Series("", index=df.index, dtype=str)
+        for col in columns_to_combine:
+            values = df[col].fillna("").astype(str)
+            valid = values.str.strip() != ""
+
+            combined = combined.mask(valid & (combined != ""), combined + " " + values)
+            combined = combined.mask(valid & (combined == ""), values)
+
+        df[output_column] = combined
 
         # Contar valores no vacíos
         non_empty = (df[output_column].notna() & (df[output_column] != "")).sum()
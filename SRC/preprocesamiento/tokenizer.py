@@ -1,11 +1,18 @@
 """
 Tokenización y eliminación de stopwords para NLP.
-Utiliza NLTK para stopwords en español y tokenización.
+Utiliza NLTK para stopwords en español y stemming; la tokenización usa una
+expresión regular precompilada (o word_tokenize de NLTK si se solicita).
 """
 
+import functools
 import logging
+import os
+import re
+import string
+import numpy as np
 import pandas as pd
-from typing import List, Set, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
 
 try:
     import nltk
@@ -20,23 +27,104 @@ from .constants import (
     DOMAIN_STOPWORDS,
     MIN_TOKEN_LENGTH,
     MAX_TOKEN_LENGTH,
+    TOKEN_PATTERN,
+    USE_NLTK_TOKENIZER,
+    TOKENIZER_ENGINE,
+    TOKENIZER_ENGINES,
+    FAST_TOKENIZER_EXTRA_PUNCTUATION,
     USE_STEMMING,
-    STEMMER_LANGUAGE
+    STEMMER_LANGUAGE,
+    TOKENIZE_CACHE_SIZE,
+    STEM_CACHE_SIZE,
+    TOKENIZATION_WORKERS,
+    PARALLEL_TOKENIZATION_MIN_TEXTS
 )
 
+# TextTokenizer propio de cada proceso worker (creado en _init_tokenize_worker)
+_worker_tokenizer = None
+
+
+def _init_tokenize_worker(use_stemming: bool, use_nltk: bool, engine: str):
+    """Inicializa el TextTokenizer del proceso worker una sola vez."""
+    global _worker_tokenizer
+    _worker_tokenizer = TextTokenizer(
+        use_stemming=use_stemming, use_nltk=use_nltk, engine=engine
+    )
+
+
+def _process_batch_worker(
+    texts: List[str],
+    remove_stopwords: bool,
+    apply_stemming: bool,
+    tokens_are_lower: bool
+) -> List[str]:
+    """
+    Procesa un lote de textos en un proceso worker.
+
+    Args:
+        texts: Textos a procesar
+        remove_stopwords: Si True, elimina stopwords
+        apply_stemming: Si True, aplica stemming
+        tokens_are_lower: Si True, los textos ya están en minúsculas
+
+    Returns:
+        Lista con los tokens de cada texto unidos por espacios
+    """
+    return _worker_tokenizer._process_batch(
+        texts, remove_stopwords, apply_stemming, tokens_are_lower
+    )
+
 
 class TextTokenizer:
     """Tokeniza texto y elimina stopwords."""
 
-    def __init__(self, use_stemming: bool = USE_STEMMING):
+    # Recursos compartidos por todas las instancias del proceso (descarga de
+    # NLTK, stopwords, stemmer y su caché), cargados una sola vez
+    _shared: Dict[tuple, Any] = {}
+
+    def __init__(
+        self,
+        use_stemming: bool = USE_STEMMING,
+        use_nltk: bool = USE_NLTK_TOKENIZER,
+        engine: str = TOKENIZER_ENGINE
+    ):
         """
         Inicializa el tokenizador.
 
         Args:
             use_stemming: Si True, aplica stemming a los tokens
+            use_nltk: Si True, tokeniza con word_tokenize de NLTK (más lento);
+                si False, con el motor indicado en engine
+            engine: Motor sin NLTK: "regex" (solo letras, TOKEN_PATTERN) o
+                "fast" (puntuación a espacios con str.translate y split; a
+                diferencia de NLTK no separa contracciones y conserva números)
+
+        Raises:
+            ValueError: Si el motor no es válido
         """
         self.logger = logging.getLogger(__name__)
         self.use_stemming = use_stemming
+        self.use_nltk = use_nltk
+
+        if engine not in TOKENIZER_ENGINES:
+            raise ValueError(
+                f"Motor de tokenización no válido: {engine}. Opciones: {TOKENIZER_ENGINES}"
+            )
+        self.engine = engine
+
+        # Tokenizador por expresión regular (solo letras)
+        self._token_pattern = re.compile(TOKEN_PATTERN)
+
+        # Tabla de traducción del motor "fast": puntuación → espacio
+        self._punct_table = str.maketrans({
+            char: " " for char in string.punctuation + FAST_TOKENIZER_EXTRA_PUNCTUATION
+        })
+
+        # Caché por instancia de process_text_to_string: los catálogos repiten
+        # descripciones y nombres de marca
+        self._process_cached = functools.lru_cache(maxsize=TOKENIZE_CACHE_SIZE)(
+            self._process_uncached
+        )
 
         # Verificar disponibilidad de NLTK
         if not NLTK_AVAILABLE:
@@ -45,21 +133,61 @@ class TextTokenizer:
             )
             raise ImportError("NLTK es requerido para tokenización")
 
-        # Descargar recursos necesarios de NLTK
-        self._download_nltk_resources()
+        # Recursos de NLTK, stopwords y stemmer se cargan en el primer uso
+        # (construir el tokenizador no hace E/S)
+        self._stopwords = None
+
+    @property
+    def stopwords(self) -> FrozenSet[str]:
+        """Stopwords (NLTK + dominio), cargadas en el primer acceso."""
+        if self._stopwords is None:
+            key = ("stopwords", "spanish")
+            if key not in self._shared:
+                self._ensure_nltk_resources()
+                self._shared[key] = self._load_stopwords()
+            self._stopwords = self._shared[key]
+        return self._stopwords
+
+    @functools.cached_property
+    def stemmer(self) -> Optional["SnowballStemmer"]:
+        """Stemmer de Snowball, creado en el primer acceso (None si no se usa)."""
+        if not self.use_stemming:
+            return None
+
+        key = ("stem", STEMMER_LANGUAGE)
+        if key in self._shared:
+            return self._shared[key]
 
-        # Cargar stopwords
-        self.stopwords = self._load_stopwords()
+        try:
+            stemmer = SnowballStemmer(STEMMER_LANGUAGE)
+            self.logger.info(f"Stemmer inicializado: {STEMMER_LANGUAGE}")
+            self._shared[key] = stemmer
+            return stemmer
+        except Exception as e:
+            self.logger.warning(f"No se pudo inicializar stemmer: {e}")
+            self.use_stemming = False
+            return None
+
+    @functools.cached_property
+    def _stem(self):
+        """stemmer.stem con caché LRU por token (pocos tokens concentran la
+        mayoría de apariciones, ley de Zipf), compartida entre instancias."""
+        if self.stemmer is None:
+            return None
+
+        key = ("stem_cache", STEMMER_LANGUAGE)
+        if key not in self._shared:
+            self._shared[key] = functools.lru_cache(maxsize=STEM_CACHE_SIZE)(
+                self.stemmer.stem
+            )
+        return self._shared[key]
 
-        # Inicializar stemmer si se requiere
-        self.stemmer = None
-        if self.use_stemming:
-            try:
-                self.stemmer = SnowballStemmer(STEMMER_LANGUAGE)
-                self.logger.info(f"Stemmer inicializado: {STEMMER_LANGUAGE}")
-            except Exception as e:
-                self.logger.warning(f"No se pudo inicializar stemmer: {e}")
-                self.use_stemming = False
+    def _ensure_nltk_resources(self):
+        """Descarga los recursos de NLTK una sola vez por proceso, en el primer uso."""
+        key = ("nltk_resources",)
+        if key not in self._shared:
+            self._download_nltk_resources()
+            self._shared[key] = True
 
     def _download_nltk_resources(self):
         """Descarga recursos necesarios de NLTK."""
@@ -78,12 +206,12 @@ class TextTokenizer:
                     except Exception as e:
                         self.logger.warning(f"No se pudo descargar {resource}: {e}")
 
-    def _load_stopwords(self) -> Set[str]:
+    def _load_stopwords(self) -> FrozenSet[str]:
         """
         Carga stopwords en español desde NLTK y las del dominio.
 
         Returns:
-            Set con todas las stopwords
+            Frozenset con todas las stopwords, en minúsculas
         """
         try:
             # Stopwords de NLTK en español
@@ -91,7 +219,9 @@ class TextTokenizer:
             self.logger.info(f"Cargadas {len(nltk_stopwords)} stopwords de NLTK")
 
             # Combinar con stopwords del dominio
-            all_stopwords = nltk_stopwords.union(DOMAIN_STOPWORDS)
+            all_stopwords = frozenset(
+                word.lower() for word in nltk_stopwords.union(DOMAIN_STOPWORDS)
+            )
 
             self.logger.info(
                 f"Total stopwords: {len(all_stopwords)} "
@@ -102,7 +232,7 @@ class TextTokenizer:
 
         except Exception as e:
             self.logger.warning(f"Error cargando stopwords: {e}. Usando solo dominio.")
-            return DOMAIN_STOPWORDS
+            return frozenset(word.lower() for word in DOMAIN_STOPWORDS)
 
     def tokenize(self, text: str) -> List[str]:
         """
@@ -117,8 +247,22 @@ class TextTokenizer:
         if not isinstance(text, str) or not text.strip():
             return []
 
+        if not self.use_nltk:
+            if self.engine == "fast":
+                # str.translate recorre el texto en C; split separa por espacios
+                tokens = text.translate(self._punct_table).split()
+            else:
+                # Una sola pasada de la regex (solo letras)
+                tokens = self._token_pattern.findall(text)
+
+            return [
+                token for token in tokens
+                if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH
+            ]
+
         try:
             # Tokenizar usando NLTK
+            self._ensure_nltk_resources()
             tokens = word_tokenize(text, language='spanish')
 
             # Filtrar tokens por longitud
@@ -130,19 +274,25 @@ class TextTokenizer:
             return tokens
 
         except Exception as e:
-            self.logger.warning(f"Error en tokenización: {e}. Usando split simple.")
+            self.logger.warning("Error en tokenización: %s. Usando split simple.", e)
             # Fallback: split simple
             return [
                 token for token in text.split()
                 if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH
             ]
 
-    def remove_stopwords(self, tokens: List[str]) -> List[str]:
+    def remove_stopwords(
+        self,
+        tokens: List[str],
+        tokens_are_lower: bool = False
+    ) -> List[str]:
         """
         Elimina stopwords de una lista de tokens.
 
         Args:
             tokens: Lista de tokens
+            tokens_are_lower: Si True, los tokens ya están en minúsculas y se
+                consultan directamente, sin llamar a lower()
 
         Returns:
             Lista de tokens sin stopwords
@@ -150,10 +300,15 @@ class TextTokenizer:
         if not tokens:
             return []
 
-        # Filtrar stopwords (case insensitive)
+        stopwords_lower = self.stopwords
+
+        if tokens_are_lower:
+            return [token for token in tokens if token not in stopwords_lower]
+
+        # Filtrar stopwords (case insensitive); lower() solo si hace falta
         filtered_tokens = [
             token for token in tokens
-            if token.lower() not in self.stopwords
+            if (token if token.islower() else token.lower()) not in stopwords_lower
         ]
 
         return filtered_tokens
@@ -172,10 +327,11 @@ class TextTokenizer:
             return tokens
 
         try:
-            stemmed_tokens = [self.stemmer.stem(token) for token in tokens]
+            stem = self._stem
+            stemmed_tokens = [stem(token) for token in tokens]
             return stemmed_tokens
         except Exception as e:
-            self.logger.warning(f"Error en stemming: {e}")
+            self.logger.warning("Error en stemming: %s", e)
             return tokens
 
     def process_text(
@@ -231,19 +387,119 @@ class TextTokenizer:
         Returns:
             String con tokens procesados unidos por espacios
         """
-        tokens = self.process_text(text, remove_stopwords, apply_stemming)
+        if not isinstance(text, str):
+            return ""
+
+        if apply_stemming is None:
+            apply_stemming = self.use_stemming
+
+        # Las opciones forman parte de la clave de la caché
+        flags = (bool(remove_stopwords) << 1) | bool(apply_stemming)
+
+        return self._process_cached(text, flags)
+
+    def _process_uncached(self, text: str, flags: int) -> str:
+        """
+        Procesa un texto con las opciones codificadas en flags
+        (bit 1: remove_stopwords, bit 0: apply_stemming).
+        Se invoca a través de la caché LRU _process_cached.
+        """
+        tokens = self.process_text(text, bool(flags & 2), bool(flags & 1))
         return " ".join(tokens)
 
+    def _process_batch(
+        self,
+        texts: Iterable,
+        remove_stopwords: bool = True,
+        apply_stemming: bool = None,
+        tokens_are_lower: bool = False
+    ) -> List[str]:
+        """
+        Procesa un lote de textos etapa por etapa (tokenización, stopwords y
+        stemming), recorriendo el lote con listas por comprensión.
+
+        Args:
+            texts: Textos a procesar
+            remove_stopwords: Si True, elimina stopwords
+            apply_stemming: Si True, aplica stemming (None usa configuración por defecto)
+            tokens_are_lower: Si True, los textos ya están en minúsculas y las
+                stopwords se filtran sin lower()
+
+        Returns:
+            Lista con los tokens de cada texto unidos por espacios
+        """
+        if apply_stemming is None:
+            apply_stemming = self.use_stemming
+
+        batch = [self.tokenize(text) for text in texts]
+
+        if remove_stopwords:
+            batch = [self.remove_stopwords(tokens, tokens_are_lower) for tokens in batch]
+
+        if apply_stemming:
+            batch = [self.apply_stemming(tokens) for tokens in batch]
+
+        return [" ".join(tokens) for tokens in batch]
+
+    def _process_batch_parallel(
+        self,
+        texts: np.ndarray,
+        remove_stopwords: bool,
+        apply_stemming: bool,
+        max_workers: int,
+        tokens_are_lower: bool = False
+    ) -> List[str]:
+        """
+        Reparte un lote de textos en bloques, uno por proceso worker.
+
+        Args:
+            texts: Textos a procesar
+            remove_stopwords: Si True, elimina stopwords
+            apply_stemming: Si True, aplica stemming
+            max_workers: Número de procesos
+            tokens_are_lower: Si True, los textos ya están en minúsculas
+
+        Returns:
+            Lista con los tokens de cada texto unidos por espacios (mismo orden)
+        """
+        self.logger.info(
+            "Tokenizando %d textos distintos en %d procesos", len(texts), max_workers
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_tokenize_worker,
+            initargs=(self.use_stemming, self.use_nltk, self.engine)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _process_batch_worker,
+                    chunk.tolist(),
+                    remove_stopwords,
+                    apply_stemming,
+                    tokens_are_lower
+                )
+                for chunk in np.array_split(texts, max_workers)
+            ]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+
+        return results
+
     def process_dataframe_column(
         self,
         df: pd.DataFrame,
         column: str,
         output_column: Optional[str] = None,
         remove_stopwords: bool = True,
-        apply_stemming: bool = None
+        apply_stemming: bool = None,
+        max_workers: Optional[int] = TOKENIZATION_WORKERS,
+        tokens_are_lower: bool = False
     ) -> pd.DataFrame:
         """
         Procesa una columna completa del DataFrame.
+        Con muchos textos distintos, la tokenización se reparte entre procesos.
 
         Args:
             df: DataFrame con los datos
@@ -251,6 +507,9 @@ class TextTokenizer:
             output_column: Nombre de la columna de salida (por defecto: column + '_tokenized')
             remove_stopwords: Si True, elimina stopwords
             apply_stemming: Si True, aplica stemming
+            max_workers: Número máximo de procesos (None = os.cpu_count(), 1 = secuencial)
+            tokens_are_lower: Si True, la columna ya está en minúsculas (p. ej. tras
+                TextCleaner) y las stopwords se filtran sin lower()
 
         Returns:
             DataFrame con la columna procesada
@@ -264,12 +523,42 @@ class TextTokenizer:
 
         self.logger.info(f"Tokenizando columna: {column} → {output_column}")
 
-        # Procesar cada valor
-        df[output_column] = df[column].apply(
-            lambda x: self.process_text_to_string(
-                x, remove_stopwords, apply_stemming
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+
+        # Cada texto distinto se procesa una única vez; map asigna el resultado
+        # a todas sus apariciones y los nulos quedan como cadena vacía
+        unique_texts = values.dropna().unique()
+
+        if apply_stemming is None:
+            apply_stemming = self.use_stemming
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        processed = None
+        if max_workers > 1 and len(unique_texts) >= PARALLEL_TOKENIZATION_MIN_TEXTS:
+            try:
+                processed = self._process_batch_parallel(
+                    np.asarray(unique_texts, dtype=object),
+                    remove_stopwords,
+                    apply_stemming,
+                    max_workers,
+                    tokens_are_lower
+                )
+            except Exception as e:
+                self.logger.warning(
+                    "Error en tokenización paralela: %s. Procesando secuencialmente.", e
+                )
+
+        if processed is None:
+            processed = self._process_batch(
+                unique_texts, remove_stopwords, apply_stemming, tokens_are_lower
             )
-        )
+
+        lookup = dict(zip(unique_texts, processed))
+        df[output_column] = values.map(lookup).fillna("").astype(str)
 
         # Contar valores procesados
         non_empty = df[output_column].notna() & (df[output_column] != "")
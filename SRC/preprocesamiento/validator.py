@@ -2,34 +2,158 @@
 Validación de calidad de datos: rangos, outliers, consistencia nutricional.
 """
 
+import functools
+import importlib.util
 import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+# numba solo se importa al usar los kernels (tablas de 1M+ filas): su
+# importación es costosa y no debe pagarse al cargar el módulo
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
 
 from .constants import (
     NUTRITIONAL_RANGES,
     NUTRITIONAL_FIELDS,
     OUTLIER_STD_THRESHOLD,
+    NUMBA_OUTLIERS_MIN_ROWS,
     KCAL_TO_KJ_FACTOR,
     ENERGY_TOLERANCE
 )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_numba_kernels():
+    """
+    Importa numba y define los kernels de outliers la primera vez que se piden.
+
+    Returns:
+        Tupla (_column_stats_njit, _outliers_njit)
+    """
+    import numba
+
+    @numba.njit(parallel=True, cache=True)
+    def _column_stats_njit(arr):
+        """
+        Media y desviación estándar (ddof=1) por columna ignorando NaN,
+        acumulando en float64 y sin matrices temporales.
+
+        Args:
+            arr: Matriz filas x columnas
+
+        Returns:
+            Tupla (medias, desviaciones); NaN si no hay suficientes valores
+        """
+        n_rows, n_cols = arr.shape
+        means = np.full(n_cols, np.nan)
+        stds = np.full(n_cols, np.nan)
+
+        for j in numba.prange(n_cols):
+            count = 0
+            total = 0.0
+            for i in range(n_rows):
+                value = arr[i, j]
+                if not np.isnan(value):
+                    count += 1
+                    total += value
+
+            if count == 0:
+                continue
+            mean = total / count
+            means[j] = mean
+
+            if count < 2:
+                continue
+            squares = 0.0
+            for i in range(n_rows):
+                value = arr[i, j]
+                if not np.isnan(value):
+                    squares += (value - mean) ** 2
+            stds[j] = np.sqrt(squares / (count - 1))
+
+        return means, stds
+
+    @numba.njit(parallel=True, cache=True)
+    def _outliers_njit(arr, mu, sigma, thr):
+        """
+        Cuenta por columna los valores con |Z-score| > thr en una sola pasada
+        (NaN nunca cuenta; columnas con sigma no positiva se omiten).
+
+        Args:
+            arr: Matriz filas x columnas
+            mu: Media por columna
+            sigma: Desviación estándar por columna
+            thr: Umbral del Z-score
+
+        Returns:
+            Array con el número de outliers por columna
+        """
+        n_rows, n_cols = arr.shape
+        counts = np.zeros(n_cols, dtype=np.int64)
+
+        for j in numba.prange(n_cols):
+            if not sigma[j] > 0:
+                continue
+            count = 0
+            for i in range(n_rows):
+                if abs((arr[i, j] - mu[j]) / sigma[j]) > thr:
+                    count += 1
+            counts[j] = count
+
+        return counts
+
+    return _column_stats_njit, _outliers_njit
+
+
 class DataValidator:
     """Valida la calidad de los datos de productos."""
 
-    def __init__(self):
-        """Inicializa el validador de datos."""
+    def __init__(self, dtype: np.dtype = np.float32):
+        """
+        Inicializa el validador de datos.
+
+        Args:
+            dtype: Tipo con el que se leen los valores nutricionales. float32
+                basta para estas magnitudes y reduce a la mitad los bytes
+                leídos; medias y desviaciones se acumulan en float64
+        """
         self.logger = logging.getLogger(__name__)
+        self.dtype = np.dtype(dtype)
+
+    def _prepare(
+        self,
+        df: pd.DataFrame
+    ) -> Tuple[np.ndarray, List[str], Dict[str, int], np.ndarray]:
+        """
+        Extrae una sola vez la submatriz nutricional que comparten las validaciones.
 
-    def validate_nutritional_ranges(self, df: pd.DataFrame) -> Dict[str, Any]:
+        Args:
+            df: DataFrame con productos
+
+        Returns:
+            Tupla (matriz filas x columnas con el tipo del validador,
+            columnas presentes, índice columna → posición, máscara de no nulos)
+        """
+        cols = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
+        arr = df[cols].to_numpy(dtype=self.dtype, na_value=np.nan)
+        col_index = {col: i for i, col in enumerate(cols)}
+        notna_mask = ~np.isnan(arr)
+
+        return arr, cols, col_index, notna_mask
+
+    def validate_nutritional_ranges(
+        self,
+        df: pd.DataFrame,
+        prepared: Optional[Tuple] = None
+    ) -> Dict[str, Any]:
         """
         Valida que los valores nutricionales estén en rangos válidos.
         NO elimina productos, solo reporta.
 
         Args:
             df: DataFrame con productos
+            prepared: Resultado de _prepare(df) (se calcula si es None)
 
         Returns:
             Diccionario con reporte de validación
@@ -42,37 +166,40 @@ class DataValidator:
             "errors_by_field": {}
         }
 
-        nutrition_cols = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
-
-        for col in nutrition_cols:
-            if col not in NUTRITIONAL_RANGES:
-                continue
+        arr, cols, _, _ = prepared if prepared is not None else self._prepare(df)
+        range_cols = [col for col in cols if col in NUTRITIONAL_RANGES]
 
-            min_val, max_val = NUTRITIONAL_RANGES[col]
-
-            # Contar valores fuera de rango
-            mask = df[col].notna() & ((df[col] < min_val) | (df[col] > max_val))
-            out_of_range = mask.sum()
+        if range_cols:
+            # Límites por columna de la matriz (sin límite en columnas sin rango),
+            # para comparar todas las columnas en una sola pasada sin copiarlas
+            mins = np.array(
+                [NUTRITIONAL_RANGES.get(col, (-np.inf, np.inf))[0] for col in cols],
+                dtype=self.dtype
+            )
+            maxs = np.array(
+                [NUTRITIONAL_RANGES.get(col, (-np.inf, np.inf))[1] for col in cols],
+                dtype=self.dtype
+            )
 
-            if out_of_range > 0:
-                report["errors_by_field"][col] = {
-                    "count": int(out_of_range),
-                    "expected_range": (min_val, max_val)
-                }
+            # NaN compara como False en ambos lados: los nulos nunca cuentan como error
+            out_of_range = (arr < mins) | (arr > maxs)
+            counts = out_of_range.sum(axis=0)
 
-                self.logger.warning(
-                    f"Campo '{col}': {out_of_range} valores fuera del rango "
-                    f"[{min_val}, {max_val}]"
-                )
+            for col, out_of_range_count in zip(cols, counts):
+                if out_of_range_count > 0:
+                    min_val, max_val = NUTRITIONAL_RANGES[col]
+                    report["errors_by_field"][col] = {
+                        "count": int(out_of_range_count),
+                        "expected_range": (min_val, max_val)
+                    }
 
-        # Contar productos con al menos un error
-        if report["errors_by_field"]:
-            error_mask = pd.Series(False, index=df.index)
-            for col in report["errors_by_field"].keys():
-                min_val, max_val = NUTRITIONAL_RANGES[col]
-                error_mask |= (df[col].notna() & ((df[col] < min_val) | (df[col] > max_val)))
+                    self.logger.warning(
+                        f"Campo '{col}': {out_of_range_count} valores fuera del rango "
+                        f"[{min_val}, {max_val}]"
+                    )
 
-            report["products_with_errors"] = int(error_mask.sum())
+            # Contar productos con al menos un error
+            report["products_with_errors"] = int(out_of_range.any(axis=1).sum())
 
         self.logger.info(
             f"Validación de rangos completada: {report['products_with_errors']} productos "
@@ -81,13 +208,18 @@ class DataValidator:
 
         return report
 
-    def detect_outliers(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def detect_outliers(
+        self,
+        df: pd.DataFrame,
+        prepared: Optional[Tuple] = None
+    ) -> Dict[str, Any]:
         """
         Detecta outliers en valores nutricionales usando Z-score.
         NO elimina productos, solo reporta.
 
         Args:
             df: DataFrame con productos
+            prepared: Resultado de _prepare(df) (se calcula si es None)
 
         Returns:
             Diccionario con outliers por campo
@@ -99,35 +231,49 @@ class DataValidator:
             "total_outliers": 0
         }
 
-        nutrition_cols = [col for col in NUTRITIONAL_FIELDS if col in df.columns]
-
-        for col in nutrition_cols:
-            values = df[col].dropna()
-
-            if len(values) < 2:
-                continue
-
-            # Calcular Z-score
-            mean = values.mean()
-            std = values.std()
-
-            if std == 0:
-                continue
-
-            z_scores = np.abs((values - mean) / std)
-            outliers = z_scores > OUTLIER_STD_THRESHOLD
-
-            outlier_count = outliers.sum()
+        values, nutrition_cols, _, notna_mask = (
+            prepared if prepared is not None else self._prepare(df)
+        )
 
-            if outlier_count > 0:
-                outliers_report["outliers_by_field"][col] = {
-                    "count": int(outlier_count),
-                    "mean": round(mean, 2),
-                    "std": round(std, 2),
-                    "threshold_z": OUTLIER_STD_THRESHOLD
-                }
+        if nutrition_cols and NUMBA_AVAILABLE and len(values) >= NUMBA_OUTLIERS_MIN_ROWS:
+            # Kernels compilados: estadísticos y conteo sin temporales, en paralelo
+            _column_stats_njit, _outliers_njit = _get_numba_kernels()
+            means, stds = _column_stats_njit(values)
+            outlier_counts = _outliers_njit(
+                values, means, stds, float(OUTLIER_STD_THRESHOLD)
+            )
 
-                outliers_report["total_outliers"] += outlier_count
+        elif nutrition_cols:
+            counts = notna_mask.sum(axis=0)
+
+            # Media y desviación (ddof=1) de todas las columnas a la vez,
+            # ignorando NaN y acumulando en float64
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = np.nansum(values, axis=0, dtype=np.float64) / counts
+                deviations = values - means
+                stds = np.sqrt(np.nansum(deviations ** 2, axis=0) / (counts - 1))
+
+            # Se omiten columnas con menos de 2 valores (std NaN) o sin dispersión
+            usable = stds > 0
+
+            # Matriz de Z-scores en una sola operación; NaN > umbral es False
+            z_scores = np.abs(deviations[:, usable]) / stds[usable]
+            outlier_counts = np.zeros(len(nutrition_cols), dtype=np.int64)
+            outlier_counts[usable] = (z_scores > OUTLIER_STD_THRESHOLD).sum(axis=0)
+
+        if nutrition_cols:
+            for col, mean, std, outlier_count in zip(
+                nutrition_cols, means, stds, outlier_counts
+            ):
+                if outlier_count > 0:
+                    outliers_report["outliers_by_field"][col] = {
+                        "count": int(outlier_count),
+                        "mean": round(mean, 2),
+                        "std": round(std, 2),
+                        "threshold_z": OUTLIER_STD_THRESHOLD
+                    }
+
+                    outliers_report["total_outliers"] += outlier_count
 
         self.logger.info(
             f"Outliers detectados: {outliers_report['total_outliers']} en "
@@ -136,13 +282,18 @@ class DataValidator:
 
         return outliers_report
 
-    def validate_consistency(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def validate_consistency(
+        self,
+        df: pd.DataFrame,
+        prepared: Optional[Tuple] = None
+    ) -> Dict[str, Any]:
         """
         Valida consistencia entre campos relacionados.
         NO elimina productos, solo reporta.
 
         Args:
             df: DataFrame con productos
+            prepared: Resultado de _prepare(df) (se calcula si es None)
 
         Returns:
             Diccionario con inconsistencias detectadas
@@ -154,90 +305,69 @@ class DataValidator:
             "total_inconsistent_products": 0
         }
 
+        arr, _, col_index, notna_mask = (
+            prepared if prepared is not None else self._prepare(df)
+        )
+
+        def column(name: str) -> np.ndarray:
+            return arr[:, col_index[name]]
+
+        def both_present(a: str, b: str) -> np.ndarray:
+            return notna_mask[:, col_index[a]] & notna_mask[:, col_index[b]]
+
+        # Cada máscara se calcula una sola vez y sirve para el conteo por tipo
+        # y para el total de productos afectados
+        masks = {}
+
         # Validación 1: grasas_saturadas <= grasas_totales
-        if "grasas_saturadas" in df.columns and "grasas_totales" in df.columns:
-            mask = (
-                df["grasas_saturadas"].notna() &
-                df["grasas_totales"].notna() &
-                (df["grasas_saturadas"] > df["grasas_totales"])
+        if "grasas_saturadas" in col_index and "grasas_totales" in col_index:
+            masks["grasas_saturadas > grasas_totales"] = (
+                both_present("grasas_saturadas", "grasas_totales") &
+                (column("grasas_saturadas") > column("grasas_totales"))
             )
-            count = mask.sum()
-            if count > 0:
-                report["inconsistencies"].append({
-                    "type": "grasas_saturadas > grasas_totales",
-                    "count": int(count)
-                })
 
         # Validación 2: azucares <= carbohidratos
-        if "azucares" in df.columns and "carbohidratos" in df.columns:
-            mask = (
-                df["azucares"].notna() &
-                df["carbohidratos"].notna() &
-                (df["azucares"] > df["carbohidratos"])
+        if "azucares" in col_index and "carbohidratos" in col_index:
+            masks["azucares > carbohidratos"] = (
+                both_present("azucares", "carbohidratos") &
+                (column("azucares") > column("carbohidratos"))
             )
-            count = mask.sum()
-            if count > 0:
-                report["inconsistencies"].append({
-                    "type": "azucares > carbohidratos",
-                    "count": int(count)
-                })
 
         # Validación 3: coherencia energética (kcal vs kj)
-        if "energia_kcal" in df.columns and "energia_kj" in df.columns:
-            mask = (
-                df["energia_kcal"].notna() &
-                df["energia_kj"].notna() &
-                (df["energia_kcal"] > 0)
+        if "energia_kcal" in col_index and "energia_kj" in col_index:
+            kcal = column("energia_kcal")
+            kj = column("energia_kj")
+            expected_kj = kcal * KCAL_TO_KJ_FACTOR
+
+            # Sobre los arrays completos, sin filtrar con .loc; los nulos y
+            # kcal <= 0 producen NaN/inf y quedan fuera por la máscara
+            with np.errstate(invalid="ignore", divide="ignore"):
+                relative_diff = np.abs(kj - expected_kj) / expected_kj
+
+            masks[f"energia_kcal y energia_kj inconsistentes (>{ENERGY_TOLERANCE*100}%)"] = (
+                (kcal > 0) & np.isfinite(relative_diff) & (relative_diff > ENERGY_TOLERANCE)
             )
 
-            if mask.any():
-                expected_kj = df.loc[mask, "energia_kcal"] * KCAL_TO_KJ_FACTOR
-                actual_kj = df.loc[mask, "energia_kj"]
-                relative_diff = np.abs(actual_kj - expected_kj) / expected_kj
-
-                inconsistent = relative_diff > ENERGY_TOLERANCE
-                count = inconsistent.sum()
-
-                if count > 0:
-                    report["inconsistencies"].append({
-                        "type": f"energia_kcal y energia_kj inconsistentes (>{ENERGY_TOLERANCE*100}%)",
-                        "count": int(count)
-                    })
-
-        # Validación 4: suma de macronutrientes <= 100g
+        # Validación 4: suma de macronutrientes <= 100g (los nulos suman 0)
         macro_cols = ["grasas_totales", "carbohidratos", "proteinas", "fibra"]
-        available_macros = [col for col in macro_cols if col in df.columns]
+        available_macros = [col_index[col] for col in macro_cols if col in col_index]
 
         if len(available_macros) >= 2:
-            suma_macros = df[available_macros].sum(axis=1)
-            mask = suma_macros > 100
-            count = mask.sum()
+            suma_macros = np.nansum(arr[:, available_macros], axis=1, dtype=np.float64)
+            masks["suma_macronutrientes > 100g"] = suma_macros > 100
 
+        for inconsistency_type, mask in masks.items():
+            count = int(mask.sum())
             if count > 0:
                 report["inconsistencies"].append({
-                    "type": "suma_macronutrientes > 100g",
-                    "count": int(count)
+                    "type": inconsistency_type,
+                    "count": count
                 })
 
-        # Contar productos con al menos una inconsistencia
-        inconsistent_mask = pd.Series(False, index=df.index)
-
-        # Aplicar todas las condiciones
-        if "grasas_saturadas" in df.columns and "grasas_totales" in df.columns:
-            inconsistent_mask |= (
-                df["grasas_saturadas"].notna() &
-                df["grasas_totales"].notna() &
-                (df["grasas_saturadas"] > df["grasas_totales"])
-            )
-
-        if "azucares" in df.columns and "carbohidratos" in df.columns:
-            inconsistent_mask |= (
-                df["azucares"].notna() &
-                df["carbohidratos"].notna() &
-                (df["azucares"] > df["carbohidratos"])
-            )
-
-        report["total_inconsistent_products"] = int(inconsistent_mask.sum())
+        # Contar productos con al menos una inconsistencia (de cualquier tipo)
+        if masks:
+            inconsistent_mask = np.logical_or.reduce(list(masks.values()))
+            report["total_inconsistent_products"] = int(inconsistent_mask.sum())
 
         self.logger.info(
             f"Inconsistencias detectadas: {len(report['inconsistencies'])} tipos, "
@@ -266,14 +396,18 @@ class DataValidator:
             "consistency": {}
         }
 
+        # Submatriz nutricional extraída una sola vez (con el tipo del
+        # validador) y compartida por las tres validaciones
+        prepared = self._prepare(df)
+
         # Validación 1: Rangos nutricionales
-        report["range_validation"] = self.validate_nutritional_ranges(df)
+        report["range_validation"] = self.validate_nutritional_ranges(df, prepared)
 
         # Validación 2: Outliers
-        report["outliers"] = self.detect_outliers(df)
+        report["outliers"] = self.detect_outliers(df, prepared)
 
         # Validación 3: Consistencia
-        report["consistency"] = self.validate_consistency(df)
+        report["consistency"] = self.validate_consistency(df, prepared)
 
         self.logger.info("Validación completa finalizada")
 
@@ -6,21 +6,40 @@ Funciones reutilizables para manejo de archivos, JSON y directorios.
 import os
 import json
 import logging
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Directorios ya asegurados en este proceso (evita repetir la llamada al sistema)
+_ensured_dirs: set = set()
+
 
 def ensure_dir(path: str) -> None:
     """
-    Crea un directorio si no existe.
+    Crea un directorio si no existe. Cada ruta se asegura una sola vez por
+    proceso; si se borra después, no se vuelve a crear.
     
     Args:
         path: Ruta del directorio a crear
     """
-    if path and not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
-        logger.debug("Directorio creado: %s", path)
+    if not path:
+        return
+
+    # Clave absoluta: una ruta relativa apunta a otro sitio tras un chdir
+    key = os.path.abspath(path)
+    if key in _ensured_dirs:
+        return
+
+    # makedirs con exist_ok ya cubre el caso de que exista (sin comprobar antes)
+    os.makedirs(path, exist_ok=True)
+    _ensured_dirs.add(key)
+    logger.debug("Directorio asegurado: %s", path)
 
 
 def ensure_dir_for_file(filepath: str) -> None:
@@ -51,6 +70,17 @@ def load_json(path: str, encoding: str = "utf-8") -> Union[Dict, List]:
         json.JSONDecodeError: Si el archivo no es JSON válido
     """
     logger.debug("Cargando JSON desde: %s", path)
+
+    # orjson (si está instalado) parsea directamente los bytes UTF-8; los
+    # tokens NaN/Infinity que escribe json.dump solo los admite json
+    if ORJSON_AVAILABLE and encoding.lower().replace("-", "") == "utf8":
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return json.loads(raw.decode(encoding))
+
     with open(path, "r", encoding=encoding) as f:
         return json.load(f)
 
@@ -70,6 +100,13 @@ def save_json(
         encoding: Codificación del archivo (default: utf-8)
         **dump_kwargs: Argumentos adicionales para json.dump
             (por defecto: ensure_ascii=False, indent=2)
+
+    Si orjson está instalado y las opciones son compatibles (UTF-8 sin
+    escapar, indent=2 y allow_nan=False), se usa orjson en modo binario; en
+    ese caso NaN e Infinity se escriben como null en lugar de lanzar
+    ValueError. Los valores que orjson no admite (tipos de NumPy, enteros de
+    más de 64 bits...) hacen que se use json sin modificar el archivo de
+    destino.
     """
     # Establecer valores por defecto si no se proporcionan
     dump_kwargs.setdefault("ensure_ascii", False)
@@ -78,10 +115,93 @@ def save_json(
     ensure_dir_for_file(path)
     
     logger.debug("Guardando JSON en: %s", path)
+
+    option = _orjson_option(encoding, dump_kwargs)
+    if option is not None:
+        # Se escribe en un temporal y se renombra al terminar: si orjson falla
+        # a mitad, el archivo de destino no llega a truncarse
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                _write_orjson(f, data, option)
+            os.replace(tmp_path, path)
+            return
+        except orjson.JSONEncodeError as e:
+            logger.debug("orjson no puede serializar los datos (%s), se usa json", e)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
     with open(path, "w", encoding=encoding) as f:
         json.dump(data, f, **dump_kwargs)
 
 
+def _write_orjson(f, data: Union[Dict, List], option: int) -> None:
+    """
+    Escribe datos con orjson (indent=2) en un archivo binario. Las listas de
+    primer nivel se serializan elemento a elemento, de modo que nunca se
+    materializa el documento completo en memoria.
+
+    Args:
+        f: Archivo abierto en modo binario
+        data: Datos a guardar
+        option: Opciones de orjson (incluye OPT_INDENT_2)
+    """
+    if not isinstance(data, list) or not data:
+        f.write(orjson.dumps(data, option=option))
+        return
+
+    # Los saltos de línea de orjson solo provienen de la indentación (en las
+    # cadenas se escapan), así que basta desplazarlos un nivel
+    f.write(b"[\n  ")
+    for i, item in enumerate(data):
+        if i:
+            f.write(b",\n  ")
+        f.write(orjson.dumps(item, option=option).replace(b"\n", b"\n  "))
+    f.write(b"\n]")
+
+
+def _orjson_option(encoding: str, dump_kwargs: Dict[str, Any]) -> Optional[int]:
+    """
+    Traduce los argumentos de json.dump a opciones de orjson.
+
+    Args:
+        encoding: Codificación del archivo de destino
+        dump_kwargs: Argumentos para json.dump
+
+    Returns:
+        Opciones de orjson, o None si orjson no está disponible o los
+        argumentos no tienen equivalente (se usa entonces json)
+    """
+    if not ORJSON_AVAILABLE or encoding.lower().replace("-", "") != "utf8":
+        return None
+
+    kwargs = dict(dump_kwargs)
+    if kwargs.pop("ensure_ascii") is not False:
+        return None
+
+    # Con indent=2 la estructura coincide con la de json; solo puede variar
+    # la representación de algunos floats (1e-05 → 0.00001, 1e+16 → 1e16)
+    if kwargs.pop("indent") != 2:
+        return None
+
+    # json escribe NaN/Infinity por defecto y orjson los convierte en null:
+    # solo se usa orjson si el llamador ya excluye esos valores
+    if kwargs.pop("allow_nan", True) is not False:
+        return None
+
+    option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+    if kwargs.pop("sort_keys", False):
+        option |= orjson.OPT_SORT_KEYS
+
+    # Cualquier otro argumento (default, separators...) solo lo admite json
+    if kwargs:
+        return None
+
+    return option
+
+
 def path_join_safe(*parts: str) -> str:
     """
     Une componentes de ruta de forma segura y normalizada.